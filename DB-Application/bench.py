@@ -0,0 +1,412 @@
+#SJSU CMPE 138 FALL 2025 TEAM6
+# Scale benchmark for every statement in the queries.py registry.
+#
+#   python bench.py                                  (1k, 10k and 100k patients)
+#   python bench.py --sizes 10000,1000000 --repeat 20
+#   python bench.py --baseline ../LOG/bench_old.json (exit 1 on regressions)
+#
+# For each size a fresh database is built in a temporary directory (schema,
+# sample data, migrations, then generate_data.generate with a fixed seed) and
+# each registered query is timed with arguments taken from that data. Paged
+# listings are timed on their first page; writes are timed inside a savepoint
+# that is rolled back, so every repetition sees the same data. The JSON report
+# has one entry per size with row counts and mean/best/p95 per query.
+#
+# The read-only detail screens are timed too, through the service layer, with
+# the number of SQL statements each one sends; a screen that starts sending
+# more statements than in the baseline counts as a regression.
+import json
+import platform
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+import connection
+import generate_data
+import main as db_setup
+import pager
+import queries
+import refcache
+import schedule
+import services
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+REPORT_PATH = BASE_DIR / "LOG" / "bench_report.json"
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+DEFAULT_REPEAT = 50
+# a query regresses if it is this much slower than the baseline ...
+REGRESSION_FACTOR = 1.5
+# ... and by at least this many milliseconds (ignores timer noise)
+REGRESSION_FLOOR_MS = 0.05
+
+TABLES = ["Patient", "Doctor", "Appointment", "Prescription", "Contains",
+          "Medication", "Pending_prescription", "Medication_dispensed", "Stock_movement",
+          "Low_stock"]
+
+
+def pick_sample(conn, today):
+    # one representative of everything the queries take as arguments, chosen
+    # from the middle of the data rather than the hand-written sample rows
+    def one(sql, params=()):
+        return conn.execute(sql, params).fetchone()
+
+    pending = one("""
+        SELECT Q.prescription_id, P.prescriber_id, P.patient_id, Pa.ssn
+        FROM Pending_prescription Q
+        JOIN Prescription P ON P.prescription_id = Q.prescription_id
+        JOIN Patient Pa ON Pa.patient_id = P.patient_id
+        ORDER BY Q.prescription_id LIMIT 1 OFFSET (SELECT COUNT(*) / 2 FROM Pending_prescription);
+    """)
+    dispensed = one("""
+        SELECT prescription_id FROM Medication_dispensed
+        ORDER BY prescription_id LIMIT 1 OFFSET (SELECT COUNT(*) / 2 FROM Medication_dispensed);
+    """)
+    contained = one("SELECT medication_name FROM Contains WHERE prescription_id = ? LIMIT 1;",
+                    (pending[0],))
+    not_contained = one("""
+        SELECT name FROM Medication
+        WHERE name NOT IN (SELECT medication_name FROM Contains WHERE prescription_id = ?)
+        ORDER BY name LIMIT 1;
+    """, (pending[0],))
+    # the generated calendar runs both sides of today, so the upcoming and
+    # this-week listings and the reorder windows all have rows
+    day = today
+    first_slot = schedule.first_slot_of_day(day)
+    manager = one("SELECT MAX(inventory_manager_id) FROM Inventory_manager;")
+    pharmacy = one("""
+        SELECT pharmacy_city, pharmacy_street FROM Pharmacist WHERE id = ?;
+    """, (manager[0],))
+    return {
+        "rx": pending[0],
+        "doctor": pending[1],
+        "patient": pending[2],
+        "ssn": pending[3],
+        "patient_name": one("SELECT name FROM Patient WHERE patient_id = ?;", (pending[2],))[0],
+        "dispensed_rx": dispensed[0],
+        "medication": contained[0],
+        "other_medication": not_contained[0],
+        "pharmacist": manager[0],
+        "pharmacy": tuple(pharmacy),
+        "department": one("SELECT department_name FROM Doctor WHERE id = ?;", (pending[1],))[0],
+        "primary_care": one("SELECT MAX(primary_care_id) FROM Primary_Care;")[0],
+        "username": one("SELECT username FROM User_Account ORDER BY user_id LIMIT 1;")[0],
+        "user_id": one("SELECT MIN(user_id) FROM User_Account;")[0],
+        "slot": first_slot,
+        "day": day.isoformat(),
+        "week_end": (day + timedelta(days=7)).isoformat(),
+    }
+
+
+def bench_params(s):
+    # arguments per registry name; a name missing here is reported as skipped
+    patient = s["patient"]
+    return {
+        "user.by_username": (s["username"],),
+        "session.identity": (s["username"],),
+        "user.insert": ("bench_user", "x", "admin", None, None, None),
+        "user.set_password": ("x", s["user_id"]),
+        "user.rehash": ("x", s["user_id"], "x"),
+        "patient.exists": (patient,),
+        "doctor.exists": (s["doctor"],),
+        "pharmacist.exists": (s["pharmacist"],),
+        "prescription.exists": (s["rx"],),
+        "medication.exists": (s["medication"],),
+        "primary_care.exists": (s["primary_care"],),
+        "patient.by_ssn": (s["ssn"],),
+        "patient.info": (patient,),
+        "patient.insurance": (patient,),
+        "patient.primary_care": (patient,),
+        "patient.assign_primary_care": (s["primary_care"], patient),
+        "appointment.insert": (patient, s["doctor"], "2030-01-02 09:00:00", "2030-01-02 09:15:00"),
+        "slot.taken": (s["doctor"], s["slot"], s["slot"] + schedule.SLOTS_PER_WEEK),
+        "doctor.busy_days": (s["day"], s["week_end"]),
+        "department.busy_days": (s["day"], s["week_end"], s["department"]),
+        "doctor.choices": (),
+        "department.details": (s["department"],),
+        "department.doctors": (s["department"],),
+        "department.insert": ("Bench Department",),
+        "pharmacy.details": s["pharmacy"],
+        "pharmacy.pharmacists": s["pharmacy"],
+        "pharmacy.insert": ("1 Bench St", "Benchville", "CA", "00000", "000-000-0000"),
+        "pharmacist.profile": (s["pharmacist"],),
+        "prescription.insert": (s["doctor"], patient, "bench"),
+        "prescription.contents": (s["rx"],),
+        "prescription.add_medication": (s["rx"], s["other_medication"]),
+        "prescription.remove_medication": (s["rx"], s["medication"]),
+        "pending.enqueue": (s["dispensed_rx"],),
+        "pending.all_ids": (),
+        "dispense.claim": (s["rx"],),
+        "dispense.record": (s["rx"], s["pharmacist"]),
+        "dispense.decrement_stock": (s["rx"],),
+        "medication.by_name": (s["medication"],),
+        "medication.update_stock": (9000, 100, s["medication"]),
+        "stock.record_dispense": (s["rx"],),
+        "stock.record_adjustment": (9000, s["medication"], 9000),
+        "stock.reorder": (s["day"], (date.fromisoformat(s["day"]) - timedelta(days=21)).isoformat(),
+                          s["week_end"]),
+        "search.patients": (f'"{s["patient_name"].split()[-1]}"*', 1000, 10),
+        "search.doctors": ('"dr"*', 1000, 10),
+        "search.medications": (f'"{s["medication"][:3]}"*', 1000, 10),
+        "search.patient_terms": (json.dumps(services.spelling_prefixes(s["patient_name"].lower())), 2, 6),
+        "search.doctor_terms": (json.dumps(services.spelling_prefixes("dr")), 1, 4),
+        "search.medication_terms": (json.dumps(services.spelling_prefixes(s["medication"].lower())), 2, 6),
+        "reference.version": (),
+        "stats.entity_counts": (),
+        "stats.by_department": (),
+        "stats.top_doctors": (10,),
+        "stats.low_stock": (),
+        "stats.db_file": (),
+        "medication.set_threshold": (10, s["medication"]),
+        # paged listings
+        "patient.list": (),
+        "patient.appointments": (patient,),
+        "patient.appointment_history": (patient,),
+        "patient.prescriptions": (patient,),
+        "prescription.by_patient_ssn": (s["ssn"],),
+        "doctor.appointments": (s["doctor"],),
+        "doctor.upcoming": (s["doctor"],),
+        "doctor.appointments_between": (s["doctor"], s["day"] + " 00:00:00", s["week_end"] + " 00:00:00"),
+        "appointment.between": (s["day"] + " 00:00:00", s["week_end"] + " 00:00:00"),
+        "doctor.prescriptions": (s["doctor"],),
+        "appointment.list": (),
+        "doctor.list": (),
+        "doctor.specialists": (),
+        "doctor.primary_care": (),
+        "department.list": (),
+        "pharmacy.list": (),
+        "medication.list": (),
+        "pending.list": (),
+        "stock.history": (s["medication"],),
+        "stock.alerts": (),
+    }
+
+
+def bench_screens(s):
+    # detail screens by the menu that shows them, as service calls
+    return {
+        "patient: medications in prescription":
+            lambda svc: svc.patients.prescription_medications(s["patient"], s["rx"]),
+        "admin: prescription medications":
+            lambda svc: svc.pharmacy.prescription_medications(s["rx"]),
+        "admin: pharmacist details":
+            lambda svc: svc.pharmacy.pharmacist(s["pharmacist"]),
+        "admin: department details":
+            lambda svc: svc.doctors.department(s["department"]),
+        "admin: pharmacy details":
+            lambda svc: svc.pharmacy.pharmacy(*s["pharmacy"]),
+        "patient: personal information":
+            lambda svc: svc.patients.info(s["patient"]),
+        "admin: patient search":
+            lambda svc: svc.patients.search(s["patient_name"]),
+        "admin: patient search (misspelt)":
+            lambda svc: svc.patients.search(s["patient_name"][:-1] + "q"),
+        "admin: patient search (transposed)":
+            lambda svc: svc.patients.search(s["patient_name"][0] + s["patient_name"][2]
+                                            + s["patient_name"][1] + s["patient_name"][3:]),
+        "admin: patient search (first letter wrong)":
+            lambda svc: svc.patients.search(("k" if s["patient_name"][0].lower() != "k" else "j")
+                                            + s["patient_name"][1:]),
+        "admin: list doctors (cached)":
+            lambda svc: svc.doctors.listing().first(),
+        "patient: doctor choices (cached)":
+            lambda svc: svc.doctors.choices(),
+        "patient: request appointment doctor list":
+            lambda svc: svc.doctors.availability(),
+        "pharmacist: low-stock alerts":
+            lambda svc: svc.pharmacy.low_stock().first(),
+        "pharmacist: reorder forecast":
+            lambda svc: svc.pharmacy.reorder_report(date.fromisoformat(s["day"])),
+    }
+
+
+def time_screen(conn, screen, repeat):
+    # statements SQLite runs itself (trigger bodies, FTS5 reading its shadow
+    # tables) are traced with a leading "--" and not counted
+    statements = []
+    conn.set_trace_callback(lambda sql: sql.startswith("--") or statements.append(sql))
+    try:
+        screen(services.Services(conn))
+    finally:
+        conn.set_trace_callback(None)
+
+    svc = services.Services(conn)
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        screen(svc)
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return {
+        "statements": len(statements),
+        "mean_ms": round(sum(timings) / len(timings) * 1000, 4),
+        "p95_ms": round(timings[max(0, int(len(timings) * 0.95) - 1)] * 1000, 4),
+    }
+
+
+def is_write(name):
+    return name in queries.QUERIES and not queries.QUERIES[name].lstrip().startswith("SELECT")
+
+
+def time_query(conn, name, params, repeat):
+    if name in queries.PAGED:
+        def run_once():
+            return pager.KeysetPager(conn, name, params).first()
+    else:
+        def run_once():
+            return queries.run(conn, name, params, "all")
+
+    write = is_write(name)
+    timings = []
+    rows = 0
+    for _ in range(repeat):
+        if write:
+            conn.execute("SAVEPOINT bench;")
+        start = time.perf_counter()
+        rows = len(run_once())
+        timings.append(time.perf_counter() - start)
+        if write:
+            conn.execute("ROLLBACK TO bench;")
+            conn.execute("RELEASE bench;")
+
+    timings.sort()
+    return {
+        "mean_ms": round(sum(timings) / len(timings) * 1000, 4),
+        "best_ms": round(timings[0] * 1000, 4),
+        "p95_ms": round(timings[max(0, int(len(timings) * 0.95) - 1)] * 1000, 4),
+        "rows": rows,
+    }
+
+
+def bench_size(patients, repeat, seed, workdir):
+    db_path = Path(workdir) / f"bench_{patients}.db"
+    conn = connection.connect(db_path, "bulk", isolation_level=None)
+    db_setup.migrate(conn)
+    start = time.perf_counter()
+    today = date.today()
+    generate_data.generate(conn, patients=patients, seed=seed, today=today, log=lambda line: None)
+    generate_seconds = time.perf_counter() - start
+    conn.close()
+
+    conn = connection.connect(db_path, cached_statements=queries.STATEMENT_CACHE_SIZE,
+                              isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    try:
+        sample = pick_sample(conn, today)
+        params = bench_params(sample)
+        results = {}
+        skipped = []
+        # the statements themselves, not the reference cache in front of them
+        refcache.enabled = False
+        try:
+            for name in list(queries.QUERIES) + list(queries.PAGED):
+                if name not in params:
+                    skipped.append(name)
+                    continue
+                results[name] = time_query(conn, name, params[name], repeat)
+        finally:
+            refcache.enabled = True
+        screens = {name: time_screen(conn, screen, repeat)
+                   for name, screen in bench_screens(sample).items()}
+        rows = {t: conn.execute(f"SELECT COUNT(*) FROM {t};").fetchone()[0] for t in TABLES}
+    finally:
+        conn.close()
+
+    return {
+        "patients": patients,
+        "rows": rows,
+        "db_bytes": db_path.stat().st_size,
+        "generate_seconds": round(generate_seconds, 2),
+        "queries": results,
+        "screens": screens,
+        "skipped": skipped,
+    }
+
+
+def find_regressions(report, baseline):
+    old_sizes = {entry["patients"]: entry for entry in baseline.get("sizes", [])}
+    regressions = []
+    for entry in report["sizes"]:
+        old = old_sizes.get(entry["patients"])
+        if old is None:
+            continue
+        for name, result in entry["queries"].items():
+            before = old["queries"].get(name)
+            if before is None:
+                continue
+            if (result["mean_ms"] > before["mean_ms"] * REGRESSION_FACTOR
+                    and result["mean_ms"] - before["mean_ms"] > REGRESSION_FLOOR_MS):
+                regressions.append({
+                    "patients": entry["patients"], "query": name,
+                    "before_ms": before["mean_ms"], "after_ms": result["mean_ms"],
+                })
+        for name, result in entry.get("screens", {}).items():
+            before = old.get("screens", {}).get(name)
+            if before is not None and result["statements"] > before["statements"]:
+                regressions.append({
+                    "patients": entry["patients"], "screen": name,
+                    "before_statements": before["statements"],
+                    "after_statements": result["statements"],
+                })
+    return regressions
+
+
+def main():
+    args = sys.argv[1:]
+
+    def option(flag, default):
+        return args[args.index(flag) + 1] if flag in args else default
+
+    sizes = [int(s) for s in option("--sizes", ",".join(map(str, DEFAULT_SIZES))).split(",")]
+    repeat = int(option("--repeat", DEFAULT_REPEAT))
+    seed = int(option("--seed", generate_data.DEFAULT_SEED))
+    out_path = Path(option("--out", REPORT_PATH))
+
+    report = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "seed": seed,
+        "repeat": repeat,
+        "sqlite_version": sqlite3.sqlite_version,
+        "python": platform.python_version(),
+        "sizes": [],
+    }
+
+    with tempfile.TemporaryDirectory() as workdir:
+        for patients in sizes:
+            print(f"Benchmarking {patients} patients ...")
+            entry = bench_size(patients, repeat, seed, workdir)
+            report["sizes"].append(entry)
+
+            slowest = sorted(entry["queries"].items(), key=lambda q: q[1]["mean_ms"], reverse=True)
+            print(f"  generated in {entry['generate_seconds']}s, {entry['db_bytes'] // 1024} KiB")
+            for name, result in slowest[:5]:
+                print(f"  {name:<32} {result['mean_ms']:>9.3f} ms mean  {result['rows']:>6} rows")
+            for name, result in entry["screens"].items():
+                print(f"  {name:<38} {result['statements']:>3} statements  {result['mean_ms']:>7.3f} ms mean")
+            if entry["skipped"]:
+                print(f"  no arguments for: {', '.join(entry['skipped'])}")
+
+    if "--baseline" in args:
+        baseline = json.loads(Path(option("--baseline", None)).read_text(encoding="utf-8"))
+        report["regressions"] = find_regressions(report, baseline)
+
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"\nReport written to {out_path}")
+
+    for r in report.get("regressions", []):
+        if "screen" in r:
+            print(f"REGRESSION {r['screen']} at {r['patients']} patients: "
+                  f"{r['before_statements']} -> {r['after_statements']} statements")
+        else:
+            print(f"REGRESSION {r['query']} at {r['patients']} patients: "
+                  f"{r['before_ms']:.3f} -> {r['after_ms']:.3f} ms")
+    if report.get("regressions"):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
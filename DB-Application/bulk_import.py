@@ -0,0 +1,317 @@
+#SJSU CMPE 138 FALL 2025 TEAM6
+# Streaming bulk loader for patients, appointments and prescriptions.
+#
+#   python bulk_import.py patients      patients.csv
+#   python bulk_import.py appointments  appointments.jsonl --batch 10000
+#   python bulk_import.py prescriptions rx.csv --rejects rx_rejects.csv
+#
+# Input is read lazily in chunks; each chunk is validated against foreign key
+# sets loaded once up front and written with one executemany in its own
+# transaction.
+import csv
+import json
+import sqlite3
+import sys
+import time
+from itertools import islice
+from pathlib import Path
+
+import connection
+import schedule
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DB_PATH = BASE_DIR / "SQL" / "schema.db"
+
+DEFAULT_BATCH = 5000
+
+
+class RejectedRow(Exception):
+    pass
+
+
+#   INPUT
+def read_records(path: Path):
+    with path.open("r", encoding="utf-8", newline="") as f:
+        if path.suffix.lower() == ".csv":
+            yield from csv.DictReader(f)
+        else:
+            # a malformed line becomes a rejected record, not the end of the import
+            for line_no, line in enumerate(f, 1):
+                line = line.strip()
+                if line:
+                    try:
+                        rec = json.loads(line)
+                    except ValueError as e:
+                        yield RejectedRow(f"line {line_no}: not valid JSON ({e})")
+                        continue
+                    if not isinstance(rec, dict):
+                        yield RejectedRow(f"line {line_no}: not a JSON object")
+                        continue
+                    yield rec
+
+
+def chunked(records, size):
+    it = iter(records)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def text(value, required=False):
+    if value is None or str(value).strip() == "":
+        if required:
+            raise RejectedRow("missing required value")
+        return None
+    return str(value).strip()
+
+
+def integer(value, required=False):
+    value = text(value, required)
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise RejectedRow(f"not an integer: {value!r}")
+
+
+def real(value):
+    value = text(value)
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        raise RejectedRow(f"not a number: {value!r}")
+
+
+#   FOREIGN KEY SETS
+def load_keys(conn):
+    return {
+        # ssn -> (name, patient_id); input files still name patients by (ssn, name)
+        "patient": {r[0]: (r[1], r[2]) for r in conn.execute("SELECT ssn, name, patient_id FROM Patient;")},
+        "doctor": {r[0] for r in conn.execute("SELECT id FROM Doctor;")},
+        "primary_care": {r[0] for r in conn.execute("SELECT primary_care_id FROM Primary_Care;")},
+        "policy": {r[0] for r in conn.execute("SELECT policy_id FROM Healthcare_Insurance;")},
+    }
+
+
+#   ROW CONVERTERS
+# Each converter turns one input record into the parameter tuple for the
+# INSERT, or raises RejectedRow. A target's optional follow-up statement runs
+# in the same transaction, bound to the highest rowid before the chunk.
+def patient_row(rec, keys):
+    ssn = text(rec.get("ssn"), required=True)
+    name = text(rec.get("name"), required=True)
+    if ssn in keys["patient"]:
+        raise RejectedRow(f"a patient with SSN {ssn} already exists")
+
+    dob_day = integer(rec.get("dob_day"))
+    dob_month = integer(rec.get("dob_month"))
+    if dob_day is not None and not 1 <= dob_day <= 31:
+        raise RejectedRow(f"dob_day out of range: {dob_day}")
+    if dob_month is not None and not 1 <= dob_month <= 12:
+        raise RejectedRow(f"dob_month out of range: {dob_month}")
+
+    pcp = integer(rec.get("primary_care_assigned_id"))
+    if pcp is not None and pcp not in keys["primary_care"]:
+        raise RejectedRow(f"unknown primary care doctor {pcp}")
+
+    # the id is only known after the INSERT; nothing in this run needs it
+    keys["patient"][ssn] = (name, None)
+    return (
+        ssn, name, integer(rec.get("age")), real(rec.get("weight")),
+        text(rec.get("phone_number")), dob_day, dob_month, integer(rec.get("dob_year")),
+        text(rec.get("street")), text(rec.get("city")), text(rec.get("state")),
+        text(rec.get("zip_code")), pcp,
+    )
+
+
+def patient_id_of(ssn, name, keys):
+    found = keys["patient"].get(ssn)
+    if found is None or found[0] != name:
+        raise RejectedRow(f"unknown patient ({ssn}, {name})")
+    return found[1]
+
+
+def appointment_row(rec, keys):
+    ssn = text(rec.get("patient_ssn"), required=True)
+    name = text(rec.get("patient_name"), required=True)
+    doctor_id = integer(rec.get("doctor_id"), required=True)
+    try:
+        start, end = schedule.normalize(text(rec.get("scheduled_datetime"), required=True))
+    except ValueError as e:
+        raise RejectedRow(str(e))
+
+    patient_id = patient_id_of(ssn, name, keys)
+    if doctor_id not in keys["doctor"]:
+        raise RejectedRow(f"unknown doctor {doctor_id}")
+
+    return (patient_id, doctor_id, start, end)
+
+
+def prescription_row(rec, keys):
+    prescriber_id = integer(rec.get("prescriber_id"), required=True)
+    policy_id = integer(rec.get("policy_id"))
+    ssn = text(rec.get("prescripted_patient_ssn"), required=True)
+    name = text(rec.get("prescripted_patient_name"), required=True)
+    dosage = text(rec.get("dosage"), required=True)
+
+    if prescriber_id not in keys["doctor"]:
+        raise RejectedRow(f"unknown prescriber {prescriber_id}")
+    if policy_id is not None and policy_id not in keys["policy"]:
+        raise RejectedRow(f"unknown policy {policy_id}")
+    patient_id = patient_id_of(ssn, name, keys)
+
+    return (prescriber_id, policy_id, patient_id, dosage)
+
+
+TARGETS = {
+    "patients": (
+        """
+        INSERT INTO Patient (ssn, name, age, weight, phone_number,
+                             dob_day, dob_month, dob_year,
+                             street, city, state, zip_code, primary_care_assigned_id)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?);
+        """,
+        patient_row,
+        None,
+    ),
+    "appointments": (
+        """
+        INSERT INTO Appointment (patient_id, doctor_id, scheduled_datetime, end_datetime)
+        VALUES (?, ?, ?, ?);
+        """,
+        appointment_row,
+        None,
+    ),
+    "prescriptions": (
+        """
+        INSERT INTO Prescription (prescriber_id, policy_id, patient_id, dosage)
+        VALUES (?, ?, ?, ?);
+        """,
+        prescription_row,
+        # new prescriptions join the pharmacy's pending queue
+        """
+        INSERT INTO Pending_prescription (prescription_id)
+        SELECT prescription_id FROM Prescription WHERE prescription_id > ?;
+        """,
+    ),
+}
+
+
+#   LOADER
+def begin_chunk(conn, table):
+    # IMMEDIATE takes the write lock up front so no other writer can add
+    # rows between reading the high-water mark and the follow-up statement
+    conn.execute("BEGIN IMMEDIATE;")
+    return conn.execute(f"SELECT COALESCE(MAX(rowid), 0) FROM {table};").fetchone()[0]
+
+
+def write_chunk(conn, insert_sql, rows, follow_up_sql=None):
+    table = insert_sql.split()[2]
+    try:
+        high_water = begin_chunk(conn, table)
+        conn.executemany(insert_sql, [params for _, params in rows])
+        if follow_up_sql:
+            conn.execute(follow_up_sql, (high_water,))
+        conn.commit()
+        return len(rows), []
+    except sqlite3.DatabaseError:
+        conn.rollback()
+
+    # something the bulk validation could not see (a CHECK constraint, a
+    # concurrent writer); fall back to row at a time for this chunk only
+    inserted = 0
+    rejects = []
+    high_water = begin_chunk(conn, table)
+    for line_no, params in rows:
+        try:
+            conn.execute(insert_sql, params)
+            inserted += 1
+        except sqlite3.DatabaseError as e:
+            rejects.append((line_no, str(e)))
+    if follow_up_sql:
+        conn.execute(follow_up_sql, (high_water,))
+    conn.commit()
+    return inserted, rejects
+
+
+def import_file(conn, target, path: Path, batch_size=DEFAULT_BATCH, rejects_out=None):
+    insert_sql, convert, follow_up_sql = TARGETS[target]
+    keys = load_keys(conn)
+
+    read = inserted = rejected = 0
+    start = time.perf_counter()
+
+    line_no = 0
+    for chunk in chunked(read_records(path), batch_size):
+        rows = []
+        chunk_rejects = []
+        for rec in chunk:
+            line_no += 1
+            try:
+                if isinstance(rec, RejectedRow):
+                    raise rec
+                rows.append((line_no, convert(rec, keys)))
+            except RejectedRow as e:
+                chunk_rejects.append((line_no, str(e)))
+
+        n, db_rejects = write_chunk(conn, insert_sql, rows, follow_up_sql) if rows else (0, [])
+        chunk_rejects.extend(db_rejects)
+
+        read += len(chunk)
+        inserted += n
+        rejected += len(chunk_rejects)
+        if rejects_out is not None:
+            for reject in chunk_rejects:
+                rejects_out.writerow(reject)
+
+        elapsed = time.perf_counter() - start
+        print(f"  {read:>10} read | {inserted:>10} inserted | {rejected:>8} rejected | "
+              f"{read / elapsed if elapsed else 0:>10.0f} rows/sec")
+
+    elapsed = time.perf_counter() - start
+    return read, inserted, rejected, elapsed
+
+
+def main():
+    args = sys.argv[1:]
+    if len(args) < 2 or args[0] not in TARGETS:
+        print(f"usage: python bulk_import.py {{{'|'.join(TARGETS)}}} FILE "
+              "[--batch N] [--rejects FILE] [--db PATH] [--profile NAME]")
+        sys.exit(2)
+
+    target, path = args[0], Path(args[1])
+    batch_size = int(args[args.index("--batch") + 1]) if "--batch" in args else DEFAULT_BATCH
+    db_path = args[args.index("--db") + 1] if "--db" in args else DB_PATH
+
+    profile = args[args.index("--profile") + 1] if "--profile" in args else "bulk"
+    conn = connection.connect(db_path, profile, isolation_level=None)
+
+    rejects_file = None
+    rejects_out = None
+    if "--rejects" in args:
+        rejects_file = open(args[args.index("--rejects") + 1], "w", encoding="utf-8", newline="")
+        rejects_out = csv.writer(rejects_file)
+        rejects_out.writerow(["record", "reason"])
+
+    print(f"Importing {target} from {path} into {db_path} (batch {batch_size})")
+    try:
+        read, inserted, rejected, elapsed = import_file(
+            conn, target, path, batch_size, rejects_out
+        )
+    finally:
+        conn.close()
+        if rejects_file:
+            rejects_file.close()
+
+    rate = read / elapsed if elapsed else 0
+    print(f"\nDone: {inserted} inserted, {rejected} rejected of {read} "
+          f"in {elapsed:.2f}s ({rate:.0f} rows/sec)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#SJSU CMPE 138 FALL 2025 TEAM6
+# Runs EXPLAIN QUERY PLAN on every statement in the queries.py registry and
+# fails if a filtered or joined table is read with a full table scan.
+#
+#   python check_query_plans.py            (fresh in-memory copy of the schema)
+#   python check_query_plans.py --db PATH  (an existing database file)
+import re
+import sqlite3
+import sys
+
+import main as db_setup
+import queries
+
+BARE_SCAN = re.compile(r"^SCAN (\w+)$")
+SUBQUERY = re.compile(r"^(?:CO-ROUTINE|MATERIALIZE) (\w+)$")
+
+
+def build_memory_db():
+    conn = sqlite3.connect(":memory:")
+    conn.execute("PRAGMA foreign_keys = ON;")
+    db_setup.migrate(conn)
+    return conn
+
+
+def check_query(conn, sql):
+    details = queries.explain(conn, sql)
+
+    # A full scan of the driving table is expected for unfiltered listings
+    # (the first page of list_patients, statistics); anything else must use
+    # an index. Reading back a subquery's own result is not a table scan.
+    has_where = re.search(r"\bWHERE\b", sql, re.IGNORECASE) is not None
+    problems = []
+    first_scan = True
+    subqueries = set()
+
+    for detail in details:
+        m = SUBQUERY.match(detail)
+        if m:
+            subqueries.add(m.group(1))
+        if not detail.startswith(("SCAN", "SEARCH")):
+            continue
+        m = BARE_SCAN.match(detail)
+        if m and m.group(1) in subqueries:
+            continue
+        if m and (has_where or not first_scan):
+            problems.append(detail)
+        first_scan = False
+
+    return details, problems
+
+
+def main():
+    args = sys.argv[1:]
+    if "--db" in args:
+        conn = sqlite3.connect(args[args.index("--db") + 1])
+    else:
+        conn = build_memory_db()
+
+    failures = 0
+    try:
+        for name, sql in queries.sample_sql():
+            if not sql.startswith(("SELECT", "UPDATE", "DELETE", "INSERT")):
+                continue
+            details, problems = check_query(conn, sql)
+            status = "FAIL" if problems else "ok"
+            print(f"[{status:>4}] {name:<36} {sql[:50]}")
+            for detail in details:
+                print(f"         {detail}")
+            if problems:
+                failures += 1
+    finally:
+        conn.close()
+
+    if failures:
+        print(f"\n{failures} query(s) fall back to a full table scan.")
+        sys.exit(1)
+    print("\nAll queries use an index.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#SJSU CMPE 138 FALL 2025 TEAM6
+# One place where SQLite connections are opened and tuned.
+#
+# The profile is chosen by, in order:
+#   1. the HOSPITAL_DB_PROFILE environment variable
+#   2. "profile" in the [connection] section of the config file
+#      (DB-Application/db_config.ini, or the path in HOSPITAL_DB_CONFIG)
+#   3. "default"
+# Any pragma listed in [connection] overrides the profile's value, and a
+# [profile:NAME] section in the config file defines an extra profile.
+import configparser
+import os
+import sqlite3
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DB_PATH = BASE_DIR / "SQL" / "schema.db"
+CONFIG_PATH = Path(__file__).resolve().parent / "db_config.ini"
+
+PRAGMAS = ("journal_mode", "synchronous", "cache_size", "mmap_size", "temp_store", "busy_timeout")
+
+PROFILES = {
+    # interactive use, several terminals on one schema.db: WAL lets readers
+    # run alongside the writer, NORMAL only fsyncs at checkpoints
+    "default": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -16000,        # KiB, ~16 MB
+        "mmap_size": 268435456,      # 256 MB
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,        # ms
+    },
+    # WAL, but fsync on every commit
+    "durable": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "cache_size": -16000,
+        "mmap_size": 268435456,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+    },
+    # one-off loads (bulk_import, data generation); not crash safe
+    "bulk": {
+        "journal_mode": "WAL",
+        "synchronous": "OFF",
+        "cache_size": -262144,       # ~256 MB
+        "mmap_size": 1073741824,     # 1 GB
+        "temp_store": "MEMORY",
+        "busy_timeout": 30000,
+    },
+    # SQLite's own defaults, i.e. what the app did before profiles existed
+    "legacy": {
+        "journal_mode": "DELETE",
+        "synchronous": "FULL",
+        "cache_size": -2000,
+        "mmap_size": 0,
+        "temp_store": "DEFAULT",
+        "busy_timeout": 0,
+    },
+}
+
+
+def load_config():
+    config = configparser.ConfigParser()
+    path = Path(os.environ.get("HOSPITAL_DB_CONFIG", CONFIG_PATH))
+    if path.exists():
+        config.read(path, encoding="utf-8")
+    return config
+
+
+def resolve_profile(name=None):
+    config = load_config()
+    section = config["connection"] if config.has_section("connection") else {}
+
+    name = name or os.environ.get("HOSPITAL_DB_PROFILE") or section.get("profile") or "default"
+
+    if config.has_section(f"profile:{name}"):
+        settings = dict(PROFILES["default"])
+        settings.update(config[f"profile:{name}"])
+    elif name in PROFILES:
+        settings = dict(PROFILES[name])
+    else:
+        raise ValueError(f"Unknown connection profile: {name}")
+
+    for pragma in PRAGMAS:
+        if pragma in section:
+            settings[pragma] = section[pragma]
+
+    return name, settings
+
+
+def apply_profile(conn, settings):
+    for pragma in PRAGMAS:
+        value = str(settings[pragma])
+        if not value.lstrip("-").isalnum():
+            raise ValueError(f"Bad value for PRAGMA {pragma}: {value!r}")
+        conn.execute(f"PRAGMA {pragma} = {value};")
+    conn.execute("PRAGMA foreign_keys = ON;")
+
+
+def connect(path=DB_PATH, profile=None, **kwargs):
+    _, settings = resolve_profile(profile)
+    kwargs.setdefault("timeout", int(settings["busy_timeout"]) / 1000)
+
+    conn = sqlite3.connect(path, **kwargs)
+    apply_profile(conn, settings)
+    return conn
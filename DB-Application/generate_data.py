@@ -0,0 +1,421 @@
+#SJSU CMPE 138 FALL 2025 TEAM6
+# Seeded synthetic data for scale testing.
+#
+#   python generate_data.py --patients 1000000
+#   python generate_data.py --patients 50000 --seed 7 --db /tmp/big.db --reset
+#   python generate_data.py --patients 1000 --today 2026-01-15
+#
+# Adds departments, doctors, insurers, pharmacies, pharmacists, medications,
+# patients, appointments, prescriptions and their Contains rows on top of
+# whatever the database already holds (normally the sample data). The same
+# seed, sizes and --today always produce the same rows. Appointments fill a
+# calendar from PAST_DAYS before "today" to CALENDAR_DAYS after its start, so
+# there is both history and upcoming work; dispenses are all in the past.
+# Everything satisfies the schema's foreign keys and CHECK constraints; the
+# counter triggers from migration 003 are left on, so the statistics stay
+# correct.
+#
+# Patients are addressed by index: patient_key(i) gives the (ssn, name) of
+# the i-th generated patient, and it is inserted as patient_id first + i, so
+# child rows can point at it without keeping a list of them in memory.
+import random
+import sqlite3
+import sys
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+import connection
+import main as db_setup
+import schedule
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DB_PATH = BASE_DIR / "SQL" / "schema.db"
+
+DEFAULT_SEED = 138
+BATCH = 10000
+
+FIRST_NAMES = [
+    "James", "Mary", "Robert", "Patricia", "John", "Jennifer", "Michael", "Linda",
+    "David", "Elizabeth", "William", "Barbara", "Richard", "Susan", "Joseph", "Jessica",
+    "Thomas", "Sarah", "Carlos", "Karen", "Wei", "Priya", "Ahmed", "Mei",
+    "Luis", "Ana", "Hiroshi", "Fatima", "Omar", "Sofia", "Ivan", "Aisha",
+]
+LAST_NAMES = [
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis",
+    "Rodriguez", "Martinez", "Hernandez", "Lopez", "Gonzalez", "Wilson", "Anderson", "Thomas",
+    "Taylor", "Moore", "Jackson", "Martin", "Lee", "Nguyen", "Patel", "Kim",
+    "Chen", "Singh", "Tanaka", "Khan", "Ali", "Rossi", "Ivanova", "Okafor",
+]
+CITIES = [
+    ("San Jose", "951"), ("Santa Clara", "950"), ("Sunnyvale", "940"),
+    ("Mountain View", "940"), ("Palo Alto", "943"), ("Milpitas", "950"),
+    ("Fremont", "945"), ("Cupertino", "950"),
+]
+STREETS = ["Main St", "Oak Ave", "Pine Rd", "Maple Dr", "Cedar Ln", "Elm St", "Park Blvd", "Lake Way"]
+DEPARTMENTS = [
+    "Cardiology", "Neurology", "Pediatrics", "Oncology", "Orthopedics", "Dermatology",
+    "Radiology", "Emergency Medicine", "Psychiatry", "Gastroenterology", "Endocrinology",
+    "Urology", "Nephrology", "Pulmonology", "Rheumatology", "Ophthalmology",
+]
+INSURERS = [
+    "Aetna", "Cigna", "Anthem", "Health Net", "Molina", "Humana", "Sutter Health Plus", "Oscar",
+]
+DRUG_STEMS = [
+    "Amlodipine", "Metformin", "Losartan", "Omeprazole", "Simvastatin", "Levothyroxine",
+    "Gabapentin", "Sertraline", "Prednisone", "Ibuprofen", "Cetirizine", "Albuterol",
+    "Warfarin", "Clopidogrel", "Furosemide", "Montelukast", "Escitalopram", "Tramadol",
+    "Pantoprazole", "Meloxicam", "Rosuvastatin", "Bupropion", "Doxycycline", "Azithromycin",
+]
+DOSAGES = [
+    "1 tablet once daily", "1 tablet twice daily", "2 tablets at bedtime",
+    "1 capsule every 8 hours", "as needed for pain, max 3 per day", "10 ml twice daily",
+]
+LOCATIONS = ["Shelf A", "Shelf B", "Shelf C", "Fridge F", "Cabinet K"]
+
+SSN_BASE = 500000000
+PAST_DAYS = 365       # calendar days before "today"
+CALENDAR_DAYS = 730   # in all, so the rest lie ahead
+SLOTS_PER_DAY = schedule.SLOTS_PER_DAY  # 15 minute slots, 08:00 - 16:45
+
+
+def patient_key(i):
+    n = SSN_BASE + i
+    ssn = f"{n // 1000000 % 1000:03d}-{n // 10000 % 100:02d}-{n % 10000:04d}"
+    # multiplicative hash so neighbouring indexes do not share a name
+    h = (i * 2654435761) % 4294967296
+    name = f"{FIRST_NAMES[h % len(FIRST_NAMES)]} {LAST_NAMES[h // 64 % len(LAST_NAMES)]}"
+    return ssn, name
+
+
+def policy_of(i, policies):
+    # every fifth patient (by hash) is uninsured
+    h = (i * 40503) % 65536
+    return None if h % 5 == 0 else policies[h % len(policies)]
+
+
+def medication_name(i):
+    return f"{DRUG_STEMS[i % len(DRUG_STEMS)]} {10 * (1 + i // len(DRUG_STEMS))}mg"
+
+
+def slot_datetime(first_day, index):
+    # index counts slots from the first one on first_day
+    day = first_day + timedelta(days=index // SLOTS_PER_DAY)
+    slot = index % SLOTS_PER_DAY
+    return f"{day.isoformat()} {8 + slot // 4:02d}:{slot % 4 * 15:02d}:00"
+
+
+def next_id(conn, table, column):
+    return conn.execute(f"SELECT COALESCE(MAX({column}), 0) + 1 FROM {table};").fetchone()[0]
+
+
+def insert_many(conn, sql, rows):
+    # rows may be a generator; feed it to SQLite in bounded batches
+    total = 0
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= BATCH:
+            conn.executemany(sql, batch)
+            total += len(batch)
+            batch.clear()
+    if batch:
+        conn.executemany(sql, batch)
+        total += len(batch)
+    return total
+
+
+#   GENERATORS
+def gen_reference(conn, rng, doctors, pharmacies, medications):
+    conn.executemany(
+        "INSERT OR IGNORE INTO Department (name) VALUES (?);",
+        [(d,) for d in DEPARTMENTS]
+    )
+
+    first_doctor = next_id(conn, "Doctor", "id")
+    doctor_ids = list(range(first_doctor, first_doctor + doctors))
+    insert_many(conn, "INSERT INTO Doctor (id, license_number, name, department_name) VALUES (?, ?, ?, ?);", (
+        (d, f"LIC{d:07d}", f"Dr. {rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+         DEPARTMENTS[k % len(DEPARTMENTS)])
+        for k, d in enumerate(doctor_ids)
+    ))
+    # even doctors do primary care, odd ones are specialists
+    primary_care = [d for d in doctor_ids if d % 2 == 0]
+    insert_many(conn, "INSERT INTO Primary_Care (primary_care_id) VALUES (?);",
+                ((d,) for d in primary_care))
+    insert_many(conn, "INSERT INTO Specialist (specialist_doctor_id, specialization) VALUES (?, ?);",
+                ((d, DEPARTMENTS[(d - first_doctor) % len(DEPARTMENTS)]) for d in doctor_ids if d % 2))
+    conn.execute("""
+        UPDATE Department
+        SET head_doctor_id = (SELECT MIN(id) FROM Doctor WHERE department_name = Department.name)
+        WHERE head_doctor_id IS NULL;
+    """)
+
+    first_policy = next_id(conn, "Healthcare_Insurance", "policy_id")
+    policies = list(range(first_policy, first_policy + len(INSURERS)))
+    conn.executemany("INSERT INTO Healthcare_Insurance (policy_id, Company) VALUES (?, ?);",
+                     list(zip(policies, INSURERS)))
+
+    first_pharmacist = next_id(conn, "Pharmacist", "id")
+    pharmacy_rows = []
+    pharmacist_rows = []
+    for p in range(pharmacies):
+        city, zip_prefix = CITIES[p % len(CITIES)]
+        street = f"{1000 + p} {STREETS[p % len(STREETS)]}"
+        zip_code = f"{zip_prefix}{p % 100:02d}"
+        pharmacy_rows.append((street, city, "CA", zip_code, f"408-{700 + p // 10000 % 100:03d}-{p % 10000:04d}"))
+        for k in range(3):
+            pid = first_pharmacist + 3 * p + k
+            pharmacist_rows.append((pid, f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                                    street, city, "CA", zip_code))
+    conn.executemany("INSERT INTO Pharmacy (street, city, state, zip_code, telephone) VALUES (?, ?, ?, ?, ?);",
+                     pharmacy_rows)
+    conn.executemany("""
+        INSERT INTO Pharmacist (id, name, pharmacy_street, pharmacy_city, pharmacy_state, pharmacy_zip_code)
+        VALUES (?, ?, ?, ?, ?, ?);
+    """, pharmacist_rows)
+    # everyone dispenses; the first pharmacist at each pharmacy also manages stock
+    dispensers = [row[0] for row in pharmacist_rows]
+    managers = dispensers[::3]
+    conn.executemany("INSERT INTO Dispenser (dispenser_id) VALUES (?);", [(d,) for d in dispensers])
+    conn.executemany("INSERT INTO Inventory_manager (inventory_manager_id) VALUES (?);", [(m,) for m in managers])
+
+    meds = []
+    for i in range(medications):
+        # about one in twenty starts close to running out
+        stock = rng.randint(2, 9) if rng.random() < 0.05 else rng.randint(50, 5000)
+        meds.append((medication_name(i), rng.randint(1, stock - 1), stock,
+                     f"{rng.choice(LOCATIONS)}{rng.randint(1, 20)}"))
+    conn.executemany("""
+        INSERT OR IGNORE INTO Medication (name, quantity_ordered, quantity_in_stock, location)
+        VALUES (?, ?, ?, ?);
+    """, meds)
+    conn.executemany("INSERT OR IGNORE INTO Manages (inventory_manager_id, medication_name) VALUES (?, ?);",
+                     [(managers[i % len(managers)], m[0]) for i, m in enumerate(meds)])
+
+    return {
+        "doctors": doctor_ids,
+        "primary_care": primary_care,
+        "policies": policies,
+        "dispensers": dispensers,
+        "medications": [m[0] for m in meds],
+    }
+
+
+def gen_patients(rng, n, ref, first):
+    for i in range(n):
+        ssn, name = patient_key(i)
+        year = rng.randint(1935, 2023)
+        city, zip_prefix = rng.choice(CITIES)
+        pcp = rng.choice(ref["primary_care"]) if ref["primary_care"] and rng.random() < 0.8 else None
+        yield (
+            first + i, ssn, name, 2025 - year, round(rng.uniform(20, 140), 1),
+            f"408-{rng.randint(200, 999)}-{rng.randint(0, 9999):04d}",
+            rng.randint(1, 28), rng.randint(1, 12), year,
+            f"{rng.randint(1, 9999)} {rng.choice(STREETS)}", city, "CA",
+            f"{zip_prefix}{rng.randint(0, 99):02d}", pcp,
+        )
+
+
+def gen_insurance(n, ref, first):
+    for i in range(n):
+        policy = policy_of(i, ref["policies"])
+        if policy is not None:
+            yield first + i, policy
+
+
+def gen_appointments(rng, n, patients, ref, first, first_day):
+    # each doctor gets a random sample of distinct calendar slots, so no
+    # doctor/time pair repeats (the slot trigger from migration 005 would
+    # reject the double booking) and only one doctor's slots are in memory
+    doctors = ref["doctors"]
+    capacity = CALENDAR_DAYS * SLOTS_PER_DAY
+    per_doctor = [0] * len(doctors)
+    for _ in range(n):
+        d = rng.randrange(len(doctors))
+        while per_doctor[d] == capacity:  # full; generate() checked the total fits
+            d = (d + 1) % len(doctors)
+        per_doctor[d] += 1
+    for doctor_id, count in zip(doctors, per_doctor):
+        for index in rng.sample(range(capacity), count):
+            when = slot_datetime(first_day, index)
+            end = (datetime.strptime(when, schedule.FORMAT)
+                   + timedelta(minutes=schedule.SLOT_MINUTES)).strftime(schedule.FORMAT)
+            yield first + rng.randrange(patients), doctor_id, when, end
+
+
+def gen_prescriptions(rng, n, patients, ref, first_id, first):
+    for k in range(n):
+        i = rng.randrange(patients)
+        yield (first_id + k, rng.choice(ref["doctors"]), policy_of(i, ref["policies"]),
+               first + i, rng.choice(DOSAGES))
+
+
+def gen_contains(rng, first_id, n, ref, per_prescription):
+    meds = ref["medications"]
+    for rx in range(first_id, first_id + n):
+        k = min(len(meds), rng.randint(1, 2 * per_prescription - 1))
+        for med in rng.sample(meds, k):
+            yield rx, med
+
+
+def gen_dispensed(rng, first_id, n, ref, dispensed_share):
+    for rx in range(first_id, first_id + n):
+        if rng.random() < dispensed_share:
+            yield rx, rng.choice(ref["dispensers"])
+
+
+#   DRIVER
+def generate(conn, patients, appointments=None, prescriptions=None, doctors=None,
+             pharmacies=None, medications=None, meds_per_prescription=2,
+             dispensed_share=0.7, seed=DEFAULT_SEED, today=None, log=print):
+    # conn must be in autocommit mode (isolation_level=None); today defaults
+    # to date.today()
+    rng = random.Random(seed)
+    today = today or date.today()
+    first_day = today - timedelta(days=PAST_DAYS)
+    appointments = 3 * patients if appointments is None else appointments
+    prescriptions = 2 * patients if prescriptions is None else prescriptions
+    doctors = doctors or max(8, patients // 500)
+    pharmacies = pharmacies or max(2, patients // 5000)
+    medications = medications or max(24, min(5000, patients // 100))
+    if appointments > doctors * CALENDAR_DAYS * SLOTS_PER_DAY:
+        raise ValueError(f"{appointments} appointments do not fit in {doctors} doctors' calendars "
+                         f"({CALENDAR_DAYS} days of {SLOTS_PER_DAY} slots each); add --doctors")
+
+    if conn.execute("SELECT 1 FROM Patient WHERE ssn = ?;", (patient_key(0)[0],)).fetchone():
+        raise ValueError("this database already holds generated patients; use --reset")
+
+    counts = {}
+    timings = {}
+
+    def step(label, func):
+        start = time.perf_counter()
+        conn.execute("BEGIN IMMEDIATE;")
+        try:
+            counts[label] = func()
+            conn.execute("COMMIT;")
+        except Exception:
+            conn.execute("ROLLBACK;")
+            raise
+        timings[label] = time.perf_counter() - start
+        rate = counts[label] / timings[label] if timings[label] else 0
+        log(f"  {label:<22} {counts[label]:>10} rows  {timings[label]:>7.2f}s  {rate:>9.0f} rows/sec")
+
+    ref = {}
+
+    def reference():
+        ref.update(gen_reference(conn, rng, doctors, pharmacies, medications))
+        return len(ref["doctors"]) + 4 * pharmacies + len(ref["medications"]) + len(ref["policies"])
+
+    step("reference data", reference)
+    first_patient = next_id(conn, "Patient", "patient_id")
+    step("patients", lambda: insert_many(conn, """
+        INSERT INTO Patient (patient_id, ssn, name, age, weight, phone_number,
+                             dob_day, dob_month, dob_year,
+                             street, city, state, zip_code, primary_care_assigned_id)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?);
+    """, gen_patients(rng, patients, ref, first_patient)))
+    step("insurance", lambda: insert_many(conn, """
+        INSERT INTO Patient_Healthcare_Insurance (patient_id, policy_id) VALUES (?, ?);
+    """, gen_insurance(patients, ref, first_patient)))
+    step("appointments", lambda: insert_many(conn, """
+        INSERT INTO Appointment (patient_id, doctor_id, scheduled_datetime, end_datetime)
+        VALUES (?, ?, ?, ?);
+    """, gen_appointments(rng, appointments, patients, ref, first_patient, first_day)))
+
+    first_rx = next_id(conn, "Prescription", "prescription_id")
+    step("prescriptions", lambda: insert_many(conn, """
+        INSERT INTO Prescription (prescription_id, prescriber_id, policy_id, patient_id, dosage)
+        VALUES (?, ?, ?, ?, ?);
+    """, gen_prescriptions(rng, prescriptions, patients, ref, first_rx, first_patient)))
+    step("contains", lambda: insert_many(conn, """
+        INSERT INTO Contains (prescription_id, medication_name) VALUES (?, ?);
+    """, gen_contains(rng, first_rx, prescriptions, ref, meds_per_prescription)))
+    step("dispensed", lambda: insert_many(conn, """
+        INSERT INTO Medication_dispensed (prescription_id, dispenser_id) VALUES (?, ?);
+    """, gen_dispensed(rng, first_rx, prescriptions, ref, dispensed_share)))
+    # whatever was not dispensed waits in the pharmacy queue
+    step("pending queue", lambda: conn.execute("""
+        INSERT INTO Pending_prescription (prescription_id)
+        SELECT prescription_id FROM Prescription P
+        WHERE prescription_id >= ?
+          AND NOT EXISTS (SELECT 1 FROM Medication_dispensed MD
+                          WHERE MD.prescription_id = P.prescription_id);
+    """, (first_rx,)).rowcount)
+    # ledger rows for the dispensed prescriptions, spread over the days
+    # before today so the reorder forecast has history. Each medication first
+    # gets a restock on the first calendar day equal to what is dispensed
+    # after it, so its ledger still sums to quantity_in_stock.
+    def stock_ledger():
+        dispensed = """
+            FROM Medication_dispensed MD
+            JOIN Contains C ON C.prescription_id = MD.prescription_id
+            WHERE MD.prescription_id >= ?
+        """
+        restocked = conn.execute(f"""
+            INSERT INTO Stock_movement (medication_name, moved_at, change, reason)
+            SELECT C.medication_name, datetime(?, '+8 hours'), COUNT(*), 'adjust'
+            {dispensed}
+            GROUP BY C.medication_name;
+        """, (first_day.isoformat(), first_rx)).rowcount
+        return restocked + conn.execute(f"""
+            INSERT INTO Stock_movement (medication_name, moved_at, change, reason, prescription_id)
+            SELECT C.medication_name,
+                   datetime(?, '+' || (MD.prescription_id % ?) || ' days', '+9 hours'),
+                   -1, 'dispense', MD.prescription_id
+            {dispensed};
+        """, (first_day.isoformat(), PAST_DAYS, first_rx)).rowcount
+
+    step("stock ledger", stock_ledger)
+
+    start = time.perf_counter()
+    conn.execute("ANALYZE;")
+    timings["analyze"] = time.perf_counter() - start
+    return counts, timings
+
+
+def main():
+    args = sys.argv[1:]
+
+    def option(flag, default, cast=int):
+        return cast(args[args.index(flag) + 1]) if flag in args else default
+
+    if "--patients" not in args:
+        print("usage: python generate_data.py --patients N [--appointments N] [--prescriptions N] "
+              "[--doctors N] [--pharmacies N] [--medications N] [--seed N] [--today YYYY-MM-DD] "
+              "[--db PATH] [--reset]")
+        sys.exit(2)
+
+    db_path = Path(option("--db", DB_PATH, str))
+    if "--reset" in args:
+        db_setup.remove_database(db_path)
+
+    conn = connection.connect(db_path, "bulk", isolation_level=None)
+    try:
+        db_setup.migrate(conn)
+        seed = option("--seed", DEFAULT_SEED)
+        print(f"Generating data into {db_path} (seed {seed})")
+        start = time.perf_counter()
+        counts, _ = generate(
+            conn,
+            patients=option("--patients", 0),
+            appointments=option("--appointments", None),
+            prescriptions=option("--prescriptions", None),
+            doctors=option("--doctors", None),
+            pharmacies=option("--pharmacies", None),
+            medications=option("--medications", None),
+            seed=seed,
+            today=option("--today", None, date.fromisoformat),
+        )
+    except (ValueError, sqlite3.DatabaseError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    finally:
+        conn.close()
+
+    print(f"\nDone: {sum(counts.values())} rows in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+#SJSU CMPE 138 FALL 2025 TEAM6
+# Load test for server.py on localhost.
+#
+#   python server.py &
+#   python load_test.py [--url http://127.0.0.1:8138] [--clients 16] [--seconds 10]
+#                       [--write-share 0.1]
+#
+# Each client thread keeps one HTTP/1.1 connection open and loops over a mix
+# of front-desk, doctor and pharmacy requests as the sample-data users
+# (SQL/sample_data.sql), a --write-share fraction of them writes. At the end
+# it prints throughput and latency percentiles per operation and the status
+# codes seen; 503s are the server's backpressure, not failures.
+import base64
+import http.client
+import json
+import random
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from urllib.parse import urlsplit
+
+USERS = {
+    "admin": ("admin", "admin123"),
+    "doctor": ("dralice", "doc123"),
+    "patient": ("johndoe", "patient123"),
+    "pharmacist": ("alicepharm", "pharm123"),
+}
+
+# (name, role, method, path, body or None)
+READS = [
+    ("doctors", "patient", "GET", "/doctors", None),
+    ("free slots", "patient", "GET", "/doctors/1/free_slots", None),
+    ("my appointments", "patient", "GET", "/me/appointments", None),
+    ("my prescriptions", "doctor", "GET", "/me/prescriptions", None),
+    ("all appointments", "admin", "GET", "/appointments?limit=50", None),
+    ("pending", "pharmacist", "GET", "/pending", None),
+    ("medications", "pharmacist", "GET", "/medications", None),
+    ("rx medications", "pharmacist", "GET", "/prescriptions/1/medications", None),
+    ("stats", "admin", "GET", "/stats", None),
+]
+
+
+def writes(rng):
+    # a taken slot is a 400 from the conflict check, not a failure
+    day = rng.randint(1, 28)
+    slot = rng.randrange(36)
+    when = f"2031-{rng.randint(1, 12):02d}-{day:02d} {8 + slot // 4:02d}:{slot % 4 * 15:02d}:00"
+    return [
+        ("book appointment", "patient", "POST", "/appointments",
+         {"doctor_id": rng.randint(1, 4), "scheduled_datetime": when}),
+        ("create prescription", "doctor", "POST", "/prescriptions",
+         {"patient_ssn": "111-22-3333", "dosage": "load test"}),
+    ]
+
+
+def auth_header(role):
+    username, password = USERS[role]
+    token = base64.b64encode(f"{username}:{password}".encode("utf-8")).decode("ascii")
+    return f"Basic {token}"
+
+
+def client(url, deadline, write_share, seed, results, statuses, lock):
+    rng = random.Random(seed)
+    parts = urlsplit(url)
+    conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=30)
+    latencies = defaultdict(list)
+    codes = Counter()
+
+    while time.perf_counter() < deadline:
+        op = rng.choice(writes(rng)) if rng.random() < write_share else rng.choice(READS)
+        name, role, method, path, body = op
+        headers = {"Authorization": auth_header(role)}
+        data = None
+        if body is not None:
+            data = json.dumps(body)
+            headers["Content-Type"] = "application/json"
+
+        start = time.perf_counter()
+        try:
+            conn.request(method, path, body=data, headers=headers)
+            response = conn.getresponse()
+            response.read()
+            status = response.status
+        except (OSError, http.client.HTTPException):
+            conn.close()
+            conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=30)
+            status = "connection error"
+        elapsed = time.perf_counter() - start
+
+        codes[status] += 1
+        if status == 200:
+            latencies[name].append(elapsed)
+        elif status == 503:
+            # back off as the server asked
+            time.sleep(0.05)
+
+    conn.close()
+    with lock:
+        for name, values in latencies.items():
+            results[name].extend(values)
+        statuses.update(codes)
+
+
+def percentile(ordered, p):
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, max(0, round(len(ordered) * p / 100) - 1))]
+
+
+def main():
+    args = sys.argv[1:]
+
+    def option(flag, default):
+        return args[args.index(flag) + 1] if flag in args else default
+
+    url = option("--url", "http://127.0.0.1:8138")
+    clients = int(option("--clients", 16))
+    seconds = float(option("--seconds", 10))
+    write_share = float(option("--write-share", 0.1))
+
+    results = defaultdict(list)
+    statuses = Counter()
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    print(f"{clients} clients against {url} for {seconds:g}s ({write_share:.0%} writes)")
+    threads = [
+        threading.Thread(target=client, args=(url, deadline, write_share, i, results, statuses, lock))
+        for i in range(clients)
+    ]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    total_ok = sum(len(v) for v in results.values())
+    print(f"\n{'Operation':<22} | {'OK':>7} | {'p50 ms':>8} | {'p95 ms':>8} | {'p99 ms':>8}")
+    print("-" * 65)
+    for name in sorted(results):
+        ordered = sorted(results[name])
+        print(f"{name:<22} | {len(ordered):>7} | {percentile(ordered, 50) * 1000:>8.2f} | "
+              f"{percentile(ordered, 95) * 1000:>8.2f} | {percentile(ordered, 99) * 1000:>8.2f}")
+
+    print(f"\n{total_ok} successful requests in {elapsed:.1f}s ({total_ok / elapsed:.0f} req/sec)")
+    print("Status codes: " + ", ".join(f"{code}: {n}" for code, n in sorted(statuses.items(), key=str)))
+
+
+if __name__ == "__main__":
+    main()
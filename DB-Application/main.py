@@ -1,12 +1,22 @@
 #SJSU CMPE 138 FALL 2025 TEAM6 
 from pathlib import Path
+import re
 import sqlite3
+import sys
+import time
+
+import connection
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 SQL_DIR = BASE_DIR / "SQL"
 DB_PATH = SQL_DIR / "schema.db"
 SCHEMA_SQL = SQL_DIR / "schema.sql"
 DATA_SQL = SQL_DIR / "sample_data.sql"
+MIGRATIONS_DIR = SQL_DIR / "migrations"
+
+# SQL/migrations/NNN_short_name.sql -- applied in version order, each one in
+# its own transaction. Files must not contain BEGIN/COMMIT themselves.
+MIGRATION_FILE = re.compile(r"^(\d+)_(\w+)\.sql$")
 
 
 def run_sql_file(conn, path: Path):
@@ -14,19 +24,136 @@ def run_sql_file(conn, path: Path):
         conn.executescript(f.read())
 
 
+def list_migrations():
+    migrations = []
+    for path in MIGRATIONS_DIR.glob("*.sql"):
+        m = MIGRATION_FILE.match(path.name)
+        if m:
+            migrations.append((int(m.group(1)), m.group(2), path))
+    return sorted(migrations)
+
+
+def ensure_migration_table(conn):
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'schema_migrations';"
+    ).fetchone()
+    if exists:
+        return
+
+    conn.execute("""
+        CREATE TABLE schema_migrations(
+            version    INTEGER PRIMARY KEY,
+            name       TEXT NOT NULL,
+            applied_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+        );
+    """)
+    # databases upgraded by the first version of main.py only carried the
+    # index migration, recorded in user_version
+    if conn.execute("PRAGMA user_version;").fetchone()[0] >= 1:
+        conn.execute(
+            "INSERT INTO schema_migrations (version, name) VALUES (1, 'fk_indexes');"
+        )
+    conn.commit()
+
+
+def applied_versions(conn):
+    return {row[0] for row in conn.execute("SELECT version FROM schema_migrations;")}
+
+
+def pending_migrations(conn):
+    done = applied_versions(conn)
+    return [m for m in list_migrations() if m[0] not in done]
+
+
+def is_empty(conn):
+    return conn.execute("SELECT COUNT(*) FROM sqlite_master;").fetchone()[0] == 0
+
+
+def initialize(conn):
+    # baseline schema + sample data, all or nothing
+    script = SCHEMA_SQL.read_text(encoding="utf-8") + "\n" + DATA_SQL.read_text(encoding="utf-8")
+    try:
+        conn.executescript("BEGIN;\n" + script)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+
+def apply_migration(conn, version, name, path):
+    # foreign keys are switched off so a migration can rebuild a table
+    # (create new, copy, drop, rename); integrity is checked before commit
+    conn.execute("PRAGMA foreign_keys = OFF;")
+    try:
+        conn.executescript("BEGIN IMMEDIATE;\n" + path.read_text(encoding="utf-8"))
+        conn.execute(
+            "INSERT INTO schema_migrations (version, name) VALUES (?, ?);",
+            (version, name)
+        )
+        broken = conn.execute("PRAGMA foreign_key_check;").fetchall()
+        if broken:
+            raise sqlite3.IntegrityError(
+                f"migration {version} leaves {len(broken)} foreign key violation(s)"
+            )
+        conn.commit()
+    except Exception:
+        if conn.in_transaction:
+            conn.rollback()
+        raise
+    finally:
+        conn.execute("PRAGMA foreign_keys = ON;")
+
+
+def remove_database(path: Path):
+    # with WAL a leftover -wal file would be replayed into a new database
+    for suffix in ("", "-wal", "-shm"):
+        path.with_name(path.name + suffix).unlink(missing_ok=True)
+
+
+def migrate(conn):
+    if is_empty(conn):
+        initialize(conn)
+    ensure_migration_table(conn)
+
+    applied = []
+    for version, name, path in pending_migrations(conn):
+        apply_migration(conn, version, name, path)
+        applied.append((version, name))
+    return applied
+
+
+def print_status(conn):
+    ensure_migration_table(conn)
+    done = applied_versions(conn)
+    for version, name, _ in list_migrations():
+        mark = "applied" if version in done else "pending"
+        print(f"{version:03d}  {name:<30} {mark}")
+
+
 def main():
-    if DB_PATH.exists():
-        DB_PATH.unlink()
+    args = sys.argv[1:]
+
+    if "--reset" in args:
+        remove_database(DB_PATH)
 
     print(f"Using database: {DB_PATH}")
-    conn = sqlite3.connect(DB_PATH)
-    conn.execute("PRAGMA foreign_keys = ON;")
+    conn = connection.connect(DB_PATH)
 
     try:
-        run_sql_file(conn, SCHEMA_SQL)
-        run_sql_file(conn, DATA_SQL)
-        conn.commit()
-        print("Database initialized successfully.")
+        if "--status" in args:
+            print_status(conn)
+            return
+
+        start = time.perf_counter()
+        applied = migrate(conn)
+        elapsed = (time.perf_counter() - start) * 1000
+
+        for version, name in applied:
+            print(f"Applied migration {version:03d}_{name}")
+        if applied:
+            print(f"Database migrated in {elapsed:.1f} ms.")
+        else:
+            print(f"Database is up to date ({elapsed:.1f} ms).")
 
     finally:
         conn.close()
@@ -0,0 +1,120 @@
+#SJSU CMPE 138 FALL 2025 TEAM6
+# Query instrumentation: slow-query log and per-statement execution detail.
+#
+# queries.run() times every named statement. While a statement runs, the
+# connection's trace callback counts the statements SQLite actually starts
+# for it (each trigger program fired, or an implicit BEGIN, adds one), and the
+# progress handler counts virtual machine steps as a cost measure that does
+# not depend on machine load. Calls at or above the threshold are written to
+# a rotating log under LOG/:
+#
+#   <ms> ms | <name> | rows=<n> | steps~<n> | stmts=<n> | params=<fp> | <sql>
+#
+# Parameter values are never logged (they are SSNs, names, ...); params is a
+# short fingerprint so repeated calls with the same arguments can be matched.
+#
+# Settings live in the [monitor] section of db_config.ini; the
+# HOSPITAL_SLOW_QUERY_MS environment variable overrides the threshold.
+import hashlib
+import logging
+import os
+import threading
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+
+import connection
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+LOG_DIR = BASE_DIR / "LOG"
+
+DEFAULTS = {
+    "enabled": "yes",
+    "slow_query_ms": "50",
+    "log_file": str(LOG_DIR / "slow_queries.log"),
+    "max_bytes": str(1024 * 1024),
+    "backup_count": "5",
+    "progress_steps": "1000",
+}
+
+logger = logging.getLogger("hospital.slow_queries")
+logger.propagate = False
+
+_settings = {"enabled": False, "threshold": 0.0, "progress_steps": 1000, "log_file": None}
+# per thread, since the HTTP server runs statements on several threads
+_current = threading.local()
+
+
+def load_settings():
+    config = connection.load_config()
+    section = config["monitor"] if config.has_section("monitor") else {}
+    settings = {key: section.get(key, default) for key, default in DEFAULTS.items()}
+    if os.environ.get("HOSPITAL_SLOW_QUERY_MS"):
+        settings["slow_query_ms"] = os.environ["HOSPITAL_SLOW_QUERY_MS"]
+    return settings
+
+
+def configure(settings=None):
+    settings = settings or load_settings()
+    _settings["enabled"] = str(settings["enabled"]).lower() in ("1", "yes", "true", "on")
+    _settings["threshold"] = float(settings["slow_query_ms"]) / 1000
+    _settings["progress_steps"] = int(settings["progress_steps"])
+
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.close()
+    if _settings["enabled"]:
+        # relative paths are relative to DB-Application/, like db_config.ini
+        path = Path(__file__).resolve().parent / settings["log_file"]
+        _settings["log_file"] = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        handler = RotatingFileHandler(
+            path, maxBytes=int(settings["max_bytes"]),
+            backupCount=int(settings["backup_count"]), encoding="utf-8",
+        )
+        handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+
+
+def slow_log():
+    # (log path, threshold ms), or None when monitoring is off
+    if not _settings["enabled"]:
+        return None
+    return _settings["log_file"], _settings["threshold"] * 1000
+
+
+def _trace(sql):
+    _current.statements = getattr(_current, "statements", 0) + 1
+
+
+def _progress():
+    _current.steps = getattr(_current, "steps", 0) + _settings["progress_steps"]
+    return 0
+
+
+def install(conn):
+    # hook a connection up; called once per connection, after configure()
+    if not _settings["enabled"]:
+        return conn
+    conn.set_trace_callback(_trace)
+    conn.set_progress_handler(_progress, _settings["progress_steps"])
+    return conn
+
+
+def begin():
+    _current.steps = 0
+    _current.statements = 0
+
+
+def fingerprint(params):
+    return hashlib.blake2b(repr(tuple(params)).encode("utf-8"), digest_size=6).hexdigest()
+
+
+def finish(name, sql, params, elapsed, rows):
+    if not _settings["enabled"] or elapsed < _settings["threshold"]:
+        return
+    logger.info(
+        "%.1f ms | %s | rows=%d | steps~%d | stmts=%d | params=%s | %s",
+        elapsed * 1000, name, rows, _current.steps, _current.statements,
+        fingerprint(params), " ".join(sql.split()),
+    )
@@ -0,0 +1,157 @@
+#SJSU CMPE 138 FALL 2025 TEAM6
+# Keyset (seek) pagination shared by every list/view screen.
+#
+# A screen names one of the listings in queries.PAGED: a SELECT without
+# ORDER BY/LIMIT plus the ORDER BY key columns (the last one must make the
+# order unique). Each page is
+#
+#     <select> WHERE <filter> AND (k1, k2) > (?, ?) ORDER BY k1, k2 LIMIT n+1
+#
+# so only one page of rows is ever held in memory and the cost of a page does
+# not depend on how far into the table it is.
+import os
+
+import queries
+import refcache
+
+PAGE_SIZE = int(os.environ.get("HOSPITAL_PAGE_SIZE", "20"))
+
+
+class KeysetPager:
+    def __init__(self, conn, name, params=(), page_size=None):
+        spec = queries.PAGED[name]
+        self.conn = conn
+        self.name = name
+        self.select_sql = " ".join(spec["select"].split())
+        # keys: [(sql expression, column name in the result row), ...]
+        self.exprs = [expr for expr, _ in spec["keys"]]
+        self.columns = [col for _, col in spec["keys"]]
+        self.where = spec.get("where")
+        self.params = tuple(params)
+        self.descending = spec.get("descending", False)
+        self.page_size = page_size or PAGE_SIZE
+
+        # starts[i] is the seek condition page i was loaded with
+        self.starts = [None]
+        self.has_next = False
+
+    def _build(self, start):
+        conditions = []
+        params = list(self.params)
+        if self.where:
+            conditions.append(f"({self.where})")
+
+        if start is not None:
+            kind, values = start
+            if kind == "after":
+                op = "<" if self.descending else ">"
+                cols = ", ".join(self.exprs)
+                marks = ", ".join("?" * len(values))
+                conditions.append(f"({cols}) {op} ({marks})")
+            else:
+                # jump: first key at or past the value the user typed
+                op = "<=" if self.descending else ">="
+                conditions.append(f"{self.exprs[0]} {op} ?")
+            params.extend(values)
+
+        direction = "DESC" if self.descending else "ASC"
+        sql = self.select_sql
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY " + ", ".join(f"{e} {direction}" for e in self.exprs)
+        sql += " LIMIT ?;"
+        params.append(self.page_size + 1)
+        return sql, params
+
+    def build_after(self):
+        # the "next page" statement, for EXPLAIN and benchmarks
+        return self._build(("after", (None,) * len(self.exprs)))
+
+    def _load(self, start):
+        sql, params = self._build(start)
+        rows = refcache.run(self.conn, self.name, params, self.page_size + 1, sql=sql)
+        self.has_next = len(rows) > self.page_size
+        return rows[:self.page_size]
+
+    def key_of(self, row):
+        return tuple(row[col] for col in self.columns)
+
+    def first(self):
+        self.starts = [None]
+        return self._load(None)
+
+    def next(self, rows):
+        start = ("after", self.key_of(rows[-1]))
+        self.starts.append(start)
+        return self._load(start)
+
+    def page_after(self, key):
+        # stateless paging (HTTP clients): the page after a key_of() value,
+        # or the first page for None
+        return self._load(None if key is None else ("after", tuple(key)))
+
+    def previous(self):
+        if len(self.starts) > 1:
+            self.starts.pop()
+        return self._load(self.starts[-1])
+
+    def jump(self, value):
+        start = ("jump", (value,))
+        rows = self._load(start)
+        if rows:
+            self.starts = [None, start]
+        else:
+            # nothing there; stay on the current page
+            self._load(self.starts[-1])
+        return rows
+
+    @property
+    def page_number(self):
+        return len(self.starts)
+
+
+def browse(conn, name, render, header=(), params=(), page_size=None, jump_label=None):
+    return show(KeysetPager(conn, name, params, page_size), render, header, jump_label)
+
+
+def show(pager, render, header=(), jump_label=None):
+    # Interactive paging loop. render(row) prints one row; header lines are
+    # repeated above every page. Returns False if there was nothing to show.
+    rows = pager.first()
+    if not rows:
+        return False
+
+    while True:
+        for line in header:
+            print(line)
+        for row in rows:
+            render(row)
+
+        if pager.page_number == 1 and not pager.has_next:
+            print()
+            return True
+
+        options = []
+        if pager.has_next:
+            options.append("[n]ext")
+        if pager.page_number > 1:
+            options.append("[p]revious")
+        if jump_label:
+            options.append("[j]ump")
+        options.append("[q]uit")
+        choice = input(f"\nPage {pager.page_number} - {' '.join(options)}: ").strip().lower()
+
+        if choice == "n" and pager.has_next:
+            rows = pager.next(rows)
+        elif choice == "p" and pager.page_number > 1:
+            rows = pager.previous()
+        elif choice == "j" and jump_label:
+            target = pager.jump(input(f"Jump to {jump_label}: ").strip())
+            if target:
+                rows = target
+            else:
+                print("Nothing at or after that point.")
+        elif choice == "q" or choice == "":
+            print()
+            return True
+        print()
@@ -0,0 +1,155 @@
+#SJSU CMPE 138 FALL 2025 TEAM6
+# Password hashing for User_Account.password_hash.
+#
+# New hashes are salted scrypt, stored together with their cost so the cost
+# can be raised later without breaking existing rows:
+#
+#   scrypt$<n>$<r>$<p>$<salt hex>$<key hex>
+#
+# Older rows hold a bare unsalted SHA-256 hex digest (the sample data still
+# does). verify() accepts both; needs_rehash() is true for anything not made
+# with the current settings, and AccountService.authenticate replaces such a
+# hash on the next successful login, while the plain password is at hand.
+#
+# scrypt is slow on purpose, and server.py checks the password on every
+# request, so check() remembers recent successful verifications per user_id
+# together with the hash they were made against. A repeat login with the same
+# password then costs one HMAC instead of a KDF run. Only an HMAC of the
+# password under a per-process random key is kept; entries expire after
+# cache_ttl seconds, the least recently used go first once cache_size is
+# reached, and forget(user_id) drops a user's entry when the password changes.
+# Failed attempts are never cached, so guessing still pays the full cost.
+#
+# Settings live in the [passwords] section of db_config.ini.
+import hashlib
+import hmac
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import connection
+
+SCHEME = "scrypt"
+SALT_BYTES = 16
+KEY_BYTES = 32
+
+DEFAULTS = {
+    "n": "16384",          # scrypt CPU/memory cost, a power of two
+    "r": "8",
+    "p": "1",
+    "cache_size": "1024",  # users remembered; 0 turns the cache off
+    "cache_ttl": "300",    # seconds
+}
+
+_settings = {}
+
+
+def load_settings():
+    config = connection.load_config()
+    section = config["passwords"] if config.has_section("passwords") else {}
+    return {key: int(section.get(key, default)) for key, default in DEFAULTS.items()}
+
+
+def configure(settings=None):
+    _settings.update(settings or load_settings())
+    _cache.resize(_settings["cache_size"], _settings["cache_ttl"])
+
+
+def current():
+    if not _settings:
+        configure()
+    return _settings
+
+
+def _scrypt(plain, salt, n, r, p):
+    # OpenSSL refuses anything over maxmem; scrypt needs about 128 * n * r bytes
+    return hashlib.scrypt(plain.encode("utf-8"), salt=salt, n=n, r=r, p=p,
+                          maxmem=256 * n * r + (1 << 20), dklen=KEY_BYTES)
+
+
+def hash_password(plain: str) -> str:
+    s = current()
+    salt = os.urandom(SALT_BYTES)
+    key = _scrypt(plain, salt, s["n"], s["r"], s["p"])
+    return f"{SCHEME}${s['n']}${s['r']}${s['p']}${salt.hex()}${key.hex()}"
+
+
+def verify(plain: str, stored: str) -> bool:
+    if stored.startswith(SCHEME + "$"):
+        try:
+            _, n, r, p, salt, key = stored.split("$")
+            expected = _scrypt(plain, bytes.fromhex(salt), int(n), int(r), int(p))
+        except ValueError:
+            return False
+        return hmac.compare_digest(expected.hex(), key)
+    # legacy: unsalted SHA-256 hex digest
+    return hmac.compare_digest(hashlib.sha256(plain.encode("utf-8")).hexdigest(), stored)
+
+
+def needs_rehash(stored: str) -> bool:
+    s = current()
+    return stored.split("$")[:4] != [SCHEME, str(s["n"]), str(s["r"]), str(s["p"])]
+
+
+#   VERIFICATION CACHE
+class VerifyCache:
+    def __init__(self, size, ttl):
+        self.size = size
+        self.ttl = ttl
+        self.secret = os.urandom(32)
+        # user_id -> (stored hash, hmac of the password, expires at)
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def resize(self, size, ttl):
+        with self.lock:
+            self.size = size
+            self.ttl = ttl
+            while len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+
+    def mac(self, plain):
+        return hmac.new(self.secret, plain.encode("utf-8"), hashlib.sha256).digest()
+
+    def hit(self, user_id, stored, plain):
+        with self.lock:
+            entry = self.entries.get(user_id)
+            if entry is None:
+                return False
+            if entry[0] != stored or entry[2] < time.monotonic():
+                del self.entries[user_id]
+                return False
+            self.entries.move_to_end(user_id)
+        return hmac.compare_digest(entry[1], self.mac(plain))
+
+    def remember(self, user_id, stored, plain):
+        if self.size <= 0:
+            return
+        entry = (stored, self.mac(plain), time.monotonic() + self.ttl)
+        with self.lock:
+            self.entries[user_id] = entry
+            self.entries.move_to_end(user_id)
+            while len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+
+    def forget(self, user_id):
+        with self.lock:
+            self.entries.pop(user_id, None)
+
+
+_cache = VerifyCache(int(DEFAULTS["cache_size"]), int(DEFAULTS["cache_ttl"]))
+
+
+def check(user_id: int, plain: str, stored: str) -> bool:
+    current()
+    if _cache.hit(user_id, stored, plain):
+        return True
+    if not verify(plain, stored):
+        return False
+    _cache.remember(user_id, stored, plain)
+    return True
+
+
+def forget(user_id: int):
+    _cache.forget(user_id)
@@ -0,0 +1,673 @@
+#SJSU CMPE 138 FALL 2025 TEAM6
+# Every SQL statement the application runs, by name.
+#
+# Statements are executed through run(), which times each call and keeps
+# per-name call counts and latency. Keeping the SQL text in one place means
+# every call for a name sends the exact same string, so it is served from the
+# sqlite3 statement cache (sized by STATEMENT_CACHE_SIZE) instead of being
+# re-prepared. check_query_plans.py EXPLAINs the whole registry, and
+# monitor.py writes the slow ones to the slow-query log.
+import math
+import threading
+import time
+from collections import deque
+
+import monitor
+
+QUERIES = {
+    #   USERS
+    "user.by_username": """
+        SELECT * FROM User_Account WHERE username = ?;
+    """,
+    # everything a logged-in session shows about its own user, in one row:
+    # the account, the patient with insurance and primary care doctor, or the
+    # doctor / pharmacist profile (columns of the other roles are NULL)
+    "session.identity": """
+        SELECT U.user_id, U.username, U.password_hash, U.role,
+               U.patient_id, U.doctor_id, U.pharmacist_id,
+               P.ssn, P.name, P.age, P.weight, P.phone_number,
+               P.dob_day, P.dob_month, P.dob_year,
+               P.street, P.city, P.state, P.zip_code,
+               P.primary_care_assigned_id,
+               PC.name AS primary_care_name, PC.department_name AS primary_care_department,
+               (SELECT json_group_array(json_object('policy_id', PHI.policy_id, 'Company', HI.Company))
+                FROM Patient_Healthcare_Insurance PHI
+                JOIN Healthcare_Insurance HI ON HI.policy_id = PHI.policy_id
+                WHERE PHI.patient_id = U.patient_id) AS insurance,
+               D.name AS doctor_name, D.department_name AS doctor_department,
+               Ph.name AS pharmacist_name,
+               EXISTS (SELECT 1 FROM Dispenser WHERE dispenser_id = U.pharmacist_id) AS is_dispenser,
+               EXISTS (SELECT 1 FROM Inventory_manager WHERE inventory_manager_id = U.pharmacist_id)
+                   AS is_inventory_manager
+        FROM User_Account U
+        LEFT JOIN Patient P ON P.patient_id = U.patient_id
+        LEFT JOIN Doctor PC ON PC.id = P.primary_care_assigned_id
+        LEFT JOIN Doctor D ON D.id = U.doctor_id
+        LEFT JOIN Pharmacist Ph ON Ph.id = U.pharmacist_id
+        WHERE U.username = ?;
+    """,
+    "user.insert": """
+        INSERT INTO User_Account
+        (username, password_hash, role, patient_id, doctor_id, pharmacist_id)
+        VALUES (?, ?, ?, ?, ?, ?);
+    """,
+    "user.set_password": """
+        UPDATE User_Account SET password_hash = ? WHERE user_id = ?;
+    """,
+    "user.rehash": """
+        UPDATE User_Account SET password_hash = ? WHERE user_id = ? AND password_hash = ?;
+    """,
+
+    #   EXISTENCE CHECKS
+    "patient.exists": """
+        SELECT 1 FROM Patient WHERE patient_id = ?;
+    """,
+    "doctor.exists": """
+        SELECT 1 FROM Doctor WHERE id = ?;
+    """,
+    "pharmacist.exists": """
+        SELECT 1 FROM Pharmacist WHERE id = ?;
+    """,
+    "prescription.exists": """
+        SELECT 1 FROM Prescription WHERE prescription_id = ?;
+    """,
+    "medication.exists": """
+        SELECT 1 FROM Medication WHERE name = ?;
+    """,
+    "primary_care.exists": """
+        SELECT 1 FROM Primary_Care WHERE primary_care_id = ?;
+    """,
+
+    #   PATIENTS
+    "patient.by_ssn": """
+        SELECT patient_id, name FROM Patient WHERE ssn = ?;
+    """,
+    "patient.info": """
+        SELECT patient_id, ssn, name, age, weight, phone_number,
+               dob_day, dob_month, dob_year,
+               street, city, state, zip_code
+        FROM Patient
+        WHERE patient_id = ?;
+    """,
+    "patient.insurance": """
+        SELECT phi.policy_id, hi.Company
+        FROM Patient_Healthcare_Insurance phi
+        JOIN Healthcare_Insurance hi ON phi.policy_id = hi.policy_id
+        WHERE phi.patient_id = ?;
+    """,
+    "patient.primary_care": """
+        SELECT P.patient_id, P.ssn, P.name, P.primary_care_assigned_id, D.name AS doctor_name, D.department_name
+        FROM Patient P
+        LEFT JOIN Primary_Care PC ON P.primary_care_assigned_id = PC.primary_care_id
+        LEFT JOIN Doctor D ON PC.primary_care_id = D.id
+        WHERE P.patient_id = ?;
+    """,
+    "patient.assign_primary_care": """
+        UPDATE Patient
+        SET primary_care_assigned_id = ?
+        WHERE patient_id = ?;
+    """,
+
+    #   APPOINTMENTS
+    "appointment.insert": """
+        INSERT INTO Appointment (patient_id, doctor_id, scheduled_datetime, end_datetime)
+        VALUES (?, ?, ?, ?);
+    """,
+    "slot.taken": """
+        SELECT slot FROM Appointment_slot WHERE doctor_id = ? AND slot >= ? AND slot < ?;
+    """,
+    # only the busy bitmaps; the doctors themselves come from doctor.choices.
+    # CROSS JOIN keeps the per-doctor range search instead of a Doctor_day scan
+    "doctor.busy_days": """
+        SELECT B.doctor_id, B.day, B.busy
+        FROM Doctor D
+        CROSS JOIN Doctor_day B ON B.doctor_id = D.id AND B.day >= ? AND B.day < ?;
+    """,
+    "department.busy_days": """
+        SELECT B.doctor_id, B.day, B.busy
+        FROM Doctor D
+        JOIN Doctor_day B ON B.doctor_id = D.id AND B.day >= ? AND B.day < ?
+        WHERE D.department_name = ?;
+    """,
+
+    #   DOCTORS / DEPARTMENTS
+    "doctor.choices": """
+        SELECT id, name, department_name FROM Doctor ORDER BY name;
+    """,
+    "department.details": """
+        SELECT D.name, D.head_doctor_id, Doc.name AS head_doctor_name,
+               COUNT(Doc2.id) AS num_doctors
+        FROM Department D
+        LEFT JOIN Doctor Doc ON D.head_doctor_id = Doc.id
+        LEFT JOIN Doctor Doc2 ON D.name = Doc2.department_name
+        WHERE D.name = ?
+        GROUP BY D.name;
+    """,
+    "department.doctors": """
+        SELECT id, name, license_number FROM Doctor WHERE department_name = ? ORDER BY name;
+    """,
+    "department.insert": """
+        INSERT INTO Department (name) VALUES (?);
+    """,
+
+    #   PHARMACIES / PHARMACISTS
+    "pharmacy.details": """
+        SELECT street, city, state, zip_code, telephone
+        FROM Pharmacy
+        WHERE city = ? AND street = ?;
+    """,
+    "pharmacy.pharmacists": """
+        SELECT id, name
+        FROM Pharmacist
+        WHERE pharmacy_city = ? AND pharmacy_street = ?
+        ORDER BY name;
+    """,
+    "pharmacy.insert": """
+        INSERT INTO Pharmacy (street, city, state, zip_code, telephone)
+        VALUES (?, ?, ?, ?, ?);
+    """,
+    # the whole details screen in one row; the managed medications come as a
+    # JSON array (a join would repeat the pharmacist on every medication row)
+    "pharmacist.profile": """
+        SELECT P.id, P.name, P.pharmacy_street, P.pharmacy_city, P.pharmacy_state, P.pharmacy_zip_code,
+               EXISTS (SELECT 1 FROM Dispenser WHERE dispenser_id = P.id) AS is_dispenser,
+               EXISTS (SELECT 1 FROM Inventory_manager WHERE inventory_manager_id = P.id)
+                   AS is_inventory_manager,
+               (SELECT json_group_array(medication_name) FROM Manages
+                WHERE inventory_manager_id = P.id) AS managed_medications
+        FROM Pharmacist P
+        WHERE P.id = ?;
+    """,
+
+    #   PRESCRIPTIONS
+    "prescription.insert": """
+        INSERT INTO Prescription (prescriber_id, patient_id, dosage)
+        VALUES (?, ?, ?);
+    """,
+    # a prescription with its medications, stock and location in one round
+    # trip: no rows means no such prescription, a single row with
+    # medication_name NULL means it contains nothing yet
+    "prescription.contents": """
+        SELECT Pr.prescription_id, Pr.patient_id, Pr.dosage, D.name AS prescriber_name,
+               C.medication_name, M.quantity_in_stock, M.location
+        FROM Prescription Pr
+        JOIN Doctor D ON D.id = Pr.prescriber_id
+        LEFT JOIN Contains C ON C.prescription_id = Pr.prescription_id
+        LEFT JOIN Medication M ON M.name = C.medication_name
+        WHERE Pr.prescription_id = ?
+        ORDER BY C.medication_name;
+    """,
+    "prescription.add_medication": """
+        INSERT INTO Contains (prescription_id, medication_name)
+        VALUES (?, ?);
+    """,
+    "prescription.remove_medication": """
+        DELETE FROM Contains
+        WHERE prescription_id = ? AND medication_name = ?;
+    """,
+
+    #   DISPENSING
+    "pending.enqueue": """
+        INSERT INTO Pending_prescription (prescription_id) VALUES (?);
+    """,
+    "pending.all_ids": """
+        SELECT prescription_id FROM Pending_prescription ORDER BY prescription_id;
+    """,
+    # claim: only one terminal can take a prescription off the queue
+    "dispense.claim": """
+        DELETE FROM Pending_prescription WHERE prescription_id = ?;
+    """,
+    # records the dispense only if the pharmacist is a dispenser and hands
+    # back how many medications the prescription contains
+    "dispense.record": """
+        INSERT INTO Medication_dispensed (prescription_id, dispenser_id)
+        SELECT ?, dispenser_id FROM Dispenser WHERE dispenser_id = ?
+        RETURNING (SELECT COUNT(*) FROM Contains C
+                   WHERE C.prescription_id = Medication_dispensed.prescription_id) AS med_count;
+    """,
+    # the guard keeps the Medication CHECK constraints true, so a short item
+    # is simply not updated and shows up in the rowcount
+    "dispense.decrement_stock": """
+        UPDATE Medication
+        SET quantity_in_stock = quantity_in_stock - 1
+        WHERE name IN (SELECT medication_name FROM Contains WHERE prescription_id = ?)
+          AND quantity_in_stock - 1 > quantity_ordered;
+    """,
+
+    #   MEDICATION
+    "medication.by_name": """
+        SELECT * FROM Medication WHERE name = ?;
+    """,
+    "medication.update_stock": """
+        UPDATE Medication
+        SET quantity_in_stock = ?, quantity_ordered = ?
+        WHERE name = ?;
+    """,
+    "medication.set_threshold": """
+        UPDATE Medication SET reorder_threshold = ? WHERE name = ?;
+    """,
+
+    #   STOCK LEDGER
+    # one -1 movement per medication of the prescription being dispensed
+    "stock.record_dispense": """
+        INSERT INTO Stock_movement (medication_name, change, reason, prescription_id)
+        SELECT medication_name, -1, 'dispense', prescription_id
+        FROM Contains
+        WHERE prescription_id = ?;
+    """,
+    # run before medication.update_stock: (new level, name, new level)
+    "stock.record_adjustment": """
+        INSERT INTO Stock_movement (medication_name, change, reason)
+        SELECT name, ? - quantity_in_stock, 'adjust'
+        FROM Medication
+        WHERE name = ? AND quantity_in_stock <> ?;
+    """,
+    # units dispensed per medication over the short and the long window:
+    # (short window start, long window start, end), days as YYYY-MM-DD
+    "stock.reorder": """
+        SELECT M.name, M.quantity_in_stock, M.quantity_ordered, M.location,
+               COALESCE(SUM(U.dispensed) FILTER (WHERE U.day >= ?), 0) AS used_short,
+               COALESCE(SUM(U.dispensed), 0) AS used_long
+        FROM Medication M
+        LEFT JOIN Medication_daily_use U
+            ON U.medication_name = M.name AND U.day >= ? AND U.day < ?
+        GROUP BY M.name;
+    """,
+
+    #   SEARCH
+    # (FTS5 match expression, candidates, limit): rank the first `candidates`
+    # matches and return the best `limit`, so a word that matches half the
+    # table costs no more than a rare one (migration 011)
+    "search.patients": """
+        SELECT P.patient_id, P.ssn, P.name, P.phone_number, P.city
+        FROM (SELECT rowid, rank FROM Patient_fts WHERE Patient_fts MATCH ? LIMIT ?) F
+        CROSS JOIN Patient P ON P.patient_id = F.rowid
+        ORDER BY F.rank
+        LIMIT ?;
+    """,
+    "search.doctors": """
+        SELECT D.id, D.name, D.department_name
+        FROM (SELECT rowid, rank FROM Doctor_fts WHERE Doctor_fts MATCH ? LIMIT ?) F
+        CROSS JOIN Doctor D ON D.id = F.rowid
+        ORDER BY F.rank
+        LIMIT ?;
+    """,
+    "search.medications": """
+        SELECT M.name, M.quantity_in_stock, M.location
+        FROM (SELECT name, rank FROM Medication_fts WHERE Medication_fts MATCH ? LIMIT ?) F
+        CROSS JOIN Medication M ON M.name = F.name
+        ORDER BY F.rank
+        LIMIT ?;
+    """,
+    # indexed words starting with any of the prefixes in a JSON list, with a
+    # length in [?, ?], for spelling suggestions; one range search per prefix
+    "search.patient_terms": """
+        SELECT T.term
+        FROM json_each(?) P
+        CROSS JOIN Patient_terms T
+        WHERE T.term >= P.value AND T.term < P.value || char(1114111)
+          AND length(T.term) BETWEEN ? AND ?;
+    """,
+    "search.doctor_terms": """
+        SELECT T.term
+        FROM json_each(?) P
+        CROSS JOIN Doctor_terms T
+        WHERE T.term >= P.value AND T.term < P.value || char(1114111)
+          AND length(T.term) BETWEEN ? AND ?;
+    """,
+    "search.medication_terms": """
+        SELECT T.term
+        FROM json_each(?) P
+        CROSS JOIN Medication_terms T
+        WHERE T.term >= P.value AND T.term < P.value || char(1114111)
+          AND length(T.term) BETWEEN ? AND ?;
+    """,
+
+    #   REFERENCE CACHE
+    # which database, and its reference data version (migration 012)
+    "reference.version": """
+        SELECT (SELECT file FROM pragma_database_list WHERE name = 'main') AS db_file,
+               db_id, n
+        FROM Reference_version
+        WHERE id = 1;
+    """,
+
+    #   STATISTICS
+    # which database file the connection is on, to key the dashboard cache
+    "stats.db_file": """
+        SELECT file FROM pragma_database_list WHERE name = 'main';
+    """,
+    "stats.entity_counts": """
+        SELECT entity, n FROM Entity_count;
+    """,
+    "stats.by_department": """
+        SELECT D.department_name,
+               COUNT(*) AS doctors,
+               SUM(A.appointments) AS appointments,
+               SUM(A.prescriptions) AS prescriptions
+        FROM Doctor_activity A
+        JOIN Doctor D ON D.id = A.doctor_id
+        GROUP BY D.department_name
+        ORDER BY appointments DESC, D.department_name;
+    """,
+    "stats.top_doctors": """
+        SELECT D.id, D.name, A.appointments, A.prescriptions
+        FROM Doctor_activity A
+        JOIN Doctor D ON D.id = A.doctor_id
+        ORDER BY A.prescriptions DESC, D.name
+        LIMIT ?;
+    """,
+    # Low_stock holds only the medications below their threshold (migration
+    # 010); CROSS JOIN keeps it as the outer loop so Medication is never scanned
+    "stats.low_stock": """
+        SELECT M.name, M.quantity_in_stock, M.location
+        FROM Low_stock L
+        CROSS JOIN Medication M ON M.name = L.medication_name
+        ORDER BY M.quantity_in_stock;
+    """,
+}
+
+
+# Paged listings for pager.py: the SELECT without ORDER BY/LIMIT, the ORDER BY
+# key columns as (expression, result column), an optional filter, and the
+# direction. The pager builds the page SQL from these.
+PAGED = {
+    "patient.list": dict(
+        select="SELECT patient_id, ssn, name, age, phone_number FROM Patient",
+        keys=[("name", "name"), ("patient_id", "patient_id")],
+    ),
+    "patient.appointments": dict(
+        select="""
+            SELECT A.appointment_id, A.scheduled_datetime, D.name AS doctor_name, D.department_name
+            FROM Upcoming_appointment A
+            JOIN Doctor D ON A.doctor_id = D.id
+        """,
+        keys=[("A.scheduled_datetime", "scheduled_datetime"), ("A.appointment_id", "appointment_id")],
+        where="A.patient_id = ?",
+    ),
+    "patient.appointment_history": dict(
+        select="""
+            SELECT A.appointment_id, A.scheduled_datetime, D.name AS doctor_name, D.department_name
+            FROM Appointment A
+            JOIN Doctor D ON A.doctor_id = D.id
+        """,
+        keys=[("A.scheduled_datetime", "scheduled_datetime"), ("A.appointment_id", "appointment_id")],
+        where="A.patient_id = ?",
+        descending=True,
+    ),
+    "patient.prescriptions": dict(
+        select="""
+            SELECT Pr.prescription_id, D.name AS prescriber_name, Pr.dosage
+            FROM Prescription Pr
+            JOIN Doctor D ON Pr.prescriber_id = D.id
+        """,
+        keys=[("Pr.prescription_id", "prescription_id")],
+        where="Pr.patient_id = ?",
+        descending=True,
+    ),
+    "prescription.by_patient_ssn": dict(
+        select="""
+            SELECT Pr.prescription_id, Pr.dosage, D.name AS doctor_name
+            FROM Patient P
+            JOIN Prescription Pr ON Pr.patient_id = P.patient_id
+            JOIN Doctor D ON Pr.prescriber_id = D.id
+        """,
+        keys=[("Pr.prescription_id", "prescription_id")],
+        where="P.ssn = ?",
+        descending=True,
+    ),
+    "doctor.appointments": dict(
+        select="""
+            SELECT A.appointment_id, A.scheduled_datetime, P.name AS patient_name
+            FROM Appointment A
+            JOIN Patient P ON P.patient_id = A.patient_id
+        """,
+        keys=[("A.scheduled_datetime", "scheduled_datetime"), ("A.appointment_id", "appointment_id")],
+        where="A.doctor_id = ?",
+    ),
+    "doctor.upcoming": dict(
+        select="""
+            SELECT A.appointment_id, A.scheduled_datetime, P.name AS patient_name
+            FROM Upcoming_appointment A
+            JOIN Patient P ON P.patient_id = A.patient_id
+        """,
+        keys=[("A.scheduled_datetime", "scheduled_datetime"), ("A.appointment_id", "appointment_id")],
+        where="A.doctor_id = ?",
+    ),
+    "doctor.appointments_between": dict(
+        select="""
+            SELECT A.appointment_id, A.scheduled_datetime, P.name AS patient_name
+            FROM Appointment A
+            JOIN Patient P ON P.patient_id = A.patient_id
+        """,
+        keys=[("A.scheduled_datetime", "scheduled_datetime"), ("A.appointment_id", "appointment_id")],
+        where="A.doctor_id = ? AND A.scheduled_datetime >= ? AND A.scheduled_datetime < ?",
+    ),
+    "doctor.prescriptions": dict(
+        select="""
+            SELECT Pr.prescription_id, P.name AS patient_name, Pr.dosage
+            FROM Prescription Pr
+            JOIN Patient P ON P.patient_id = Pr.patient_id
+        """,
+        keys=[("Pr.prescription_id", "prescription_id")],
+        where="Pr.prescriber_id = ?",
+        descending=True,
+    ),
+    "appointment.list": dict(
+        select="""
+            SELECT A.appointment_id, A.scheduled_datetime, P.name AS patient_name, D.name AS doctor_name
+            FROM Appointment A
+            JOIN Patient P ON P.patient_id = A.patient_id
+            JOIN Doctor D ON A.doctor_id = D.id
+        """,
+        keys=[("A.scheduled_datetime", "scheduled_datetime"), ("A.appointment_id", "appointment_id")],
+    ),
+    "appointment.between": dict(
+        select="""
+            SELECT A.appointment_id, A.scheduled_datetime, P.name AS patient_name, D.name AS doctor_name
+            FROM Appointment A
+            JOIN Patient P ON P.patient_id = A.patient_id
+            JOIN Doctor D ON A.doctor_id = D.id
+        """,
+        keys=[("A.scheduled_datetime", "scheduled_datetime"), ("A.appointment_id", "appointment_id")],
+        where="A.scheduled_datetime >= ? AND A.scheduled_datetime < ?",
+    ),
+    "doctor.list": dict(
+        select="SELECT id, name, license_number, department_name FROM Doctor",
+        keys=[("name", "name"), ("id", "id")],
+    ),
+    "doctor.specialists": dict(
+        select="""
+            SELECT D.id, D.name, D.license_number, D.department_name, S.specialization
+            FROM Doctor D
+            JOIN Specialist S ON D.id = S.specialist_doctor_id
+        """,
+        keys=[("D.name", "name"), ("D.id", "id")],
+    ),
+    "doctor.primary_care": dict(
+        select="""
+            SELECT D.id, D.name, D.license_number, D.department_name
+            FROM Doctor D
+            JOIN Primary_Care PC ON D.id = PC.primary_care_id
+        """,
+        keys=[("D.name", "name"), ("D.id", "id")],
+    ),
+    "department.list": dict(
+        select="""
+            SELECT D.name, D.head_doctor_id, Doc.name AS head_doctor_name
+            FROM Department D
+            LEFT JOIN Doctor Doc ON D.head_doctor_id = Doc.id
+        """,
+        keys=[("D.name", "name")],
+    ),
+    "pharmacy.list": dict(
+        select="SELECT street, city, state, zip_code, telephone FROM Pharmacy",
+        keys=[("city", "city"), ("street", "street"), ("state", "state"), ("zip_code", "zip_code")],
+    ),
+    "medication.list": dict(
+        select="""
+            SELECT name, quantity_in_stock, quantity_ordered, location, reorder_threshold
+            FROM Medication
+        """,
+        keys=[("name", "name")],
+    ),
+    "stock.alerts": dict(
+        select="""
+            SELECT L.medication_name AS name, M.quantity_in_stock, M.reorder_threshold,
+                   M.quantity_ordered, M.location, L.since
+            FROM Low_stock L
+            CROSS JOIN Medication M ON M.name = L.medication_name
+        """,
+        keys=[("L.medication_name", "name")],
+    ),
+    "stock.history": dict(
+        select="""
+            SELECT movement_id, moved_at, change, reason, prescription_id
+            FROM Stock_movement
+        """,
+        keys=[("movement_id", "movement_id")],
+        where="medication_name = ?",
+        descending=True,
+    ),
+    # driven by the pending queue, so every page is a rowid range scan
+    "pending.list": dict(
+        select="""
+            SELECT Pr.prescription_id, P.name AS patient_name, P.ssn AS patient_ssn,
+                   D.name AS doctor_name, Pr.dosage
+            FROM Pending_prescription Q
+            JOIN Prescription Pr ON Pr.prescription_id = Q.prescription_id
+            JOIN Patient P ON P.patient_id = Pr.patient_id
+            JOIN Doctor D ON Pr.prescriber_id = D.id
+        """,
+        keys=[("Q.prescription_id", "prescription_id")],
+    ),
+}
+
+# each paged listing prepares at most three shapes (first page, after a key,
+# jump to a key); leave headroom for ad hoc and maintenance statements
+STATEMENT_CACHE_SIZE = len(QUERIES) + 3 * len(PAGED) + 32
+
+# latency samples kept per name for the percentile report
+SAMPLE_SIZE = 1000
+
+
+class QueryStats:
+    __slots__ = ("calls", "rows", "total", "max", "samples")
+
+    def __init__(self):
+        self.calls = 0
+        self.rows = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples = deque(maxlen=SAMPLE_SIZE)
+
+    @property
+    def mean(self):
+        return self.total / self.calls if self.calls else 0.0
+
+    def percentile(self, p):
+        # nearest-rank percentile over the most recent SAMPLE_SIZE calls
+        if not self.samples:
+            return 0.0
+        with _stats_lock:
+            ordered = sorted(self.samples)
+        rank = max(1, math.ceil(len(ordered) * p / 100))
+        return ordered[rank - 1]
+
+
+STATS = {}
+_stats_lock = threading.Lock()
+
+
+def record(name, elapsed, rows):
+    with _stats_lock:
+        stats = STATS.get(name)
+        if stats is None:
+            stats = STATS[name] = QueryStats()
+        stats.calls += 1
+        stats.rows += rows
+        stats.total += elapsed
+        stats.samples.append(elapsed)
+        if elapsed > stats.max:
+            stats.max = elapsed
+
+
+def run(conn, name, params=(), fetch=None, sql=None):
+    # fetch: None -> the cursor (for writes / rowcount), "one", "all", or an
+    # int n -> fetchmany(n). sql overrides the registered text (pager pages).
+    if sql is None:
+        sql = QUERIES[name]
+
+    monitor.begin()
+    start = time.perf_counter()
+    cur = conn.execute(sql, params)
+    if fetch is None:
+        result = cur
+        rows = max(cur.rowcount, 0)
+    elif fetch == "one":
+        result = cur.fetchone()
+        rows = 0 if result is None else 1
+    elif fetch == "all":
+        result = cur.fetchall()
+        rows = len(result)
+    else:
+        result = cur.fetchmany(fetch)
+        rows = len(result)
+        cur.close()
+    elapsed = time.perf_counter() - start
+    record(name, elapsed, rows)
+    monitor.finish(name, sql, params, elapsed, rows)
+    return result
+
+
+def fetch_one(conn, name, params=()):
+    return run(conn, name, params, "one")
+
+
+def fetch_all(conn, name, params=()):
+    return run(conn, name, params, "all")
+
+
+def reset_stats():
+    STATS.clear()
+
+
+def report():
+    # [(name, QueryStats)], slowest total first
+    with _stats_lock:
+        items = list(STATS.items())
+    return sorted(items, key=lambda item: item[1].total, reverse=True)
+
+
+def sample_sql():
+    # (name, sql) for every statement in a form EXPLAIN can take; paged
+    # listings are expanded to their "next page" shape
+    import pager
+
+    for name, sql in QUERIES.items():
+        yield name, " ".join(sql.split())
+    for name in PAGED:
+        sql, _ = pager.KeysetPager(None, name).build_after()
+        yield name, sql
+
+
+def explain(conn, sql):
+    params = (None,) * sql.count("?")
+    return [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, params)]
+
+
+def benchmark(conn, name, params=(), repeat=100):
+    # (mean, best) seconds for a read-only statement; paged listings are
+    # timed on their first page
+    if name in PAGED:
+        import pager
+        run_once = lambda: pager.KeysetPager(conn, name, params).first()
+    else:
+        run_once = lambda: run(conn, name, params, "all")
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run_once()
+        timings.append(time.perf_counter() - start)
+    return sum(timings) / len(timings), min(timings)
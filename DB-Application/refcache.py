@@ -0,0 +1,71 @@
+#SJSU CMPE 138 FALL 2025 TEAM6
+# In-process cache for the reference listings (doctors, departments,
+# pharmacies) that every menu visit used to re-query.
+#
+# Results are kept per (database, statement, parameters) in an LRU of at most
+# CACHE_SIZE entries, each tagged with the database's Reference_version
+# counter. Triggers bump that counter on any write to the reference tables
+# (migration 012), from this connection, another server thread or another
+# process, so a read first checks the counter (one single-row lookup) and
+# only re-runs the listing when it moved. Reads inside an open transaction
+# bypass the cache, since that transaction may still roll back.
+#
+#   rows = refcache.run(conn, "doctor.choices", (), "all")
+import threading
+from collections import OrderedDict
+
+import queries
+
+CACHE_SIZE = 256
+CACHED = frozenset({
+    "doctor.choices",
+    "doctor.list",
+    "doctor.specialists",
+    "doctor.primary_care",
+    "department.list",
+    "department.details",
+    "department.doctors",
+    "pharmacy.list",
+})
+
+# bench.py turns this off to time the statements themselves
+enabled = True
+
+_cache = OrderedDict()
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0}
+
+
+def run(conn, name, params=(), fetch=None, sql=None):
+    # queries.run() for reads, answered from the cache for CACHED listings
+    if not enabled or name not in CACHED or fetch is None or conn.in_transaction:
+        return queries.run(conn, name, params, fetch, sql)
+
+    db_file, db_id, version = queries.fetch_one(conn, "reference.version")
+    key = (db_file, db_id, name, sql, tuple(params), fetch)
+    with _lock:
+        entry = _cache.get(key)
+        if entry is not None and entry[0] == version:
+            _cache.move_to_end(key)
+            _stats["hits"] += 1
+            return list(entry[1]) if isinstance(entry[1], list) else entry[1]
+        _stats["misses"] += 1
+
+    result = queries.run(conn, name, params, fetch, sql)
+    with _lock:
+        _cache[key] = (version, result)
+        _cache.move_to_end(key)
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return list(result) if isinstance(result, list) else result
+
+
+def stats():
+    with _lock:
+        return dict(_stats, entries=len(_cache))
+
+
+def clear():
+    with _lock:
+        _cache.clear()
+        _stats.update(hits=0, misses=0)
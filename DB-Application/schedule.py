@@ -0,0 +1,105 @@
+#SJSU CMPE 138 FALL 2025 TEAM6
+# Appointment times and slots.
+#
+# The clinic day runs from OPEN_HOUR to CLOSE_HOUR in SLOT_MINUTES slots and
+# an appointment takes exactly one slot. Slots are numbered from the epoch:
+#
+#   slot = unixepoch(start) / (SLOT_MINUTES * 60)
+#
+# which is the expression the triggers of migration 005 use to fill
+# Appointment_slot, keyed on (doctor_id, slot). Times are naive local times
+# stored as "YYYY-MM-DD HH:MM:SS", so they sort and compare as text.
+#
+# Migration 006 also keeps a bitmap per doctor and day in Doctor_day.busy:
+# bit i set means the i-th slot of the opening hours is booked. FULL_DAY has
+# every opening-hours bit set; earliest_free() picks the lowest clear bit.
+import calendar
+from datetime import datetime, timedelta
+
+SLOT_MINUTES = 15
+SLOT_SECONDS = SLOT_MINUTES * 60
+OPEN_HOUR = 8
+CLOSE_HOUR = 17
+SLOTS_PER_DAY = (CLOSE_HOUR - OPEN_HOUR) * 60 // SLOT_MINUTES
+SLOTS_PER_WEEK = 7 * 24 * 60 // SLOT_MINUTES
+FULL_DAY = (1 << SLOTS_PER_DAY) - 1
+# how far ahead a free-slot search looks before giving up
+SEARCH_WEEKS = 52
+
+FORMAT = "%Y-%m-%d %H:%M:%S"
+INPUT_FORMATS = ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%dT%H:%M")
+
+
+def parse(text: str) -> datetime:
+    text = (text or "").strip()
+    for fmt in INPUT_FORMATS:
+        try:
+            return datetime.strptime(text, fmt)
+        except ValueError:
+            pass
+    raise ValueError("Date/time must look like YYYY-MM-DD HH:MM.")
+
+
+def day_range(first: str, last: str):
+    # [start, end) covering the days first..last, both "YYYY-MM-DD"
+    try:
+        start = datetime.strptime(first.strip(), "%Y-%m-%d")
+        end = datetime.strptime(last.strip(), "%Y-%m-%d") + timedelta(days=1)
+    except ValueError:
+        raise ValueError("Dates must look like YYYY-MM-DD.")
+    if end <= start:
+        raise ValueError("The end date is before the start date.")
+    return start.strftime(FORMAT), end.strftime(FORMAT)
+
+
+def normalize(text: str):
+    # (start, end) of the appointment as stored, or ValueError for the user
+    start = parse(text)
+    if start.minute % SLOT_MINUTES or start.second:
+        raise ValueError(f"Appointments start on a {SLOT_MINUTES} minute boundary.")
+    if not OPEN_HOUR <= start.hour < CLOSE_HOUR:
+        raise ValueError(f"Appointments are between {OPEN_HOUR:02d}:00 and {CLOSE_HOUR:02d}:00.")
+    end = start + timedelta(minutes=SLOT_MINUTES)
+    return start.strftime(FORMAT), end.strftime(FORMAT)
+
+
+def slot_of(when: datetime) -> int:
+    return calendar.timegm(when.timetuple()) // SLOT_SECONDS
+
+
+def slot_start(slot: int) -> datetime:
+    return datetime(1970, 1, 1) + timedelta(seconds=slot * SLOT_SECONDS)
+
+
+def first_slot_of_day(day) -> int:
+    return slot_of(datetime(day.year, day.month, day.day, OPEN_HOUR))
+
+
+def next_bookable(after: datetime) -> int:
+    # first slot in opening hours that starts at or after `after`
+    slot = -(-calendar.timegm(after.timetuple()) // SLOT_SECONDS)
+    day = slot_start(slot).date()
+    first = first_slot_of_day(day)
+    if slot < first:
+        return first
+    if slot >= first + SLOTS_PER_DAY:
+        return first_slot_of_day(day + timedelta(days=1))
+    return slot
+
+
+def bookable(lo: int, hi: int):
+    # open slots in [lo, hi), lo being bookable itself
+    slot = lo
+    while slot < hi:
+        first = first_slot_of_day(slot_start(slot).date())
+        for s in range(slot, min(first + SLOTS_PER_DAY, hi)):
+            yield s
+        slot = first_slot_of_day(slot_start(slot).date() + timedelta(days=1))
+
+
+def earliest_free(busy: int, from_index: int = 0):
+    # index of the lowest free slot at or after from_index, or None
+    free = FULL_DAY & ~busy & ~((1 << from_index) - 1)
+    if not free:
+        return None
+    return (free & -free).bit_length() - 1
@@ -0,0 +1,587 @@
+#SJSU CMPE 138 FALL 2025 TEAM6
+# HTTP/JSON front end so many desks and pharmacies can share one schema.db.
+#
+#   python server.py [--host 127.0.0.1] [--port 8138] [--db PATH]
+#
+# Reads run on a bounded pool of query_only connections. Every write is handed
+# to a single writer thread that owns the only read-write connection, through a
+# bounded queue, so SQLite never sees two writers fight over the lock. When
+# all read connections are busy and the backlog is full, or the write queue is
+# full, the request is refused straight away with 503 and Retry-After instead
+# of piling up threads. A write still queued after the timeout is dropped with
+# 504; one that has started is waited for, so a 504 always means "not done".
+# Sizes come from the [server] section of db_config.ini.
+#
+# Requests authenticate with HTTP Basic against User_Account; each route lists
+# the roles allowed to call it, and patient/doctor/pharmacist routes act on the
+# logged-in user's own records. Listings take ?limit=N&after=<next> where
+# "next" is the value returned with the previous page.
+#
+#   GET  /health                                  (no login)
+#   GET  /metrics                                 admin
+#   GET  /stats                                   admin
+#   GET  /doctors                                 any role
+#   GET  /doctors/<id>/free_slots?n=5             any role
+#   GET  /departments/<name>/earliest_slot?days=7 any role
+#   GET  /appointments[?from=YYYY-MM-DD&to=...]   admin
+#   GET  /me/appointments                         patient (upcoming only), doctor
+#                                                 (?upcoming=1, ?from=&to=)
+#   GET  /me/prescriptions                        patient, doctor
+#   POST /appointments  {doctor_id, scheduled_datetime[, patient_ssn]}
+#                                                 patient (self), admin
+#   GET  /prescriptions/<id>/medications          any role (patients: own only)
+#   POST /prescriptions {patient_ssn, dosage}     doctor
+#   POST /prescriptions/<id>/medications {medication_name}
+#                                                 admin, doctor
+#   GET  /pending                                 pharmacist, admin
+#   POST /dispense {prescription_ids: [...]}      pharmacist
+#   GET  /medications                             pharmacist, admin
+#   GET  /medications/reorder[?as_of=YYYY-MM-DD]  pharmacist, admin
+#   GET  /medications/low_stock                   pharmacist, admin (below threshold)
+#   GET  /medications/<name>                      pharmacist, admin
+#   PUT  /medications/<name> {in_stock, ordered[, reorder_threshold]}
+#                                                 pharmacist
+import base64
+import json
+import queue
+import re
+import sqlite3
+import sys
+import threading
+import traceback
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from contextlib import contextmanager
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import connection
+import monitor
+import pager
+import passwords
+import queries
+import refcache
+import services
+import stats
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DB_PATH = BASE_DIR / "SQL" / "schema.db"
+
+DEFAULTS = {
+    "host": "127.0.0.1",
+    "port": "8138",
+    "read_connections": "4",
+    "read_backlog": "32",        # requests allowed to wait for a read connection
+    "write_queue": "64",         # writes allowed to wait for the writer
+    "request_timeout": "5",      # seconds a request waits before giving up
+}
+MAX_PAGE = 100
+MAX_BODY = 64 * 1024
+
+
+class Overloaded(Exception):
+    pass
+
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def load_settings():
+    config = connection.load_config()
+    section = config["server"] if config.has_section("server") else {}
+    return {key: section.get(key, default) for key, default in DEFAULTS.items()}
+
+
+def open_connection(db_path, read_only):
+    conn = connection.connect(db_path, check_same_thread=False,
+                              cached_statements=queries.STATEMENT_CACHE_SIZE)
+    conn.row_factory = sqlite3.Row
+    if read_only:
+        conn.execute("PRAGMA query_only = ON;")
+    return monitor.install(conn)
+
+
+#   CONNECTIONS
+class ReadPool:
+    def __init__(self, db_path, size, backlog, timeout):
+        self.timeout = timeout
+        self.size = size
+        self._idle = queue.LifoQueue()
+        for _ in range(size):
+            self._idle.put(services.Services(open_connection(db_path, read_only=True)))
+        # one slot per connection plus the allowed backlog
+        self._slots = threading.BoundedSemaphore(size + backlog)
+        self.rejected = 0
+
+    @contextmanager
+    def reading(self):
+        if not self._slots.acquire(blocking=False):
+            self.rejected += 1
+            raise Overloaded("read backlog full")
+        try:
+            try:
+                svc = self._idle.get(timeout=self.timeout)
+            except queue.Empty:
+                self.rejected += 1
+                raise Overloaded("no read connection available")
+            try:
+                yield svc
+            finally:
+                self._idle.put(svc)
+        finally:
+            self._slots.release()
+
+    def close(self):
+        while not self._idle.empty():
+            self._idle.get_nowait().conn.close()
+
+
+class Writer:
+    # one thread, one read-write connection; jobs are func(svc) -> result
+    def __init__(self, db_path, queue_size, timeout):
+        self.timeout = timeout
+        self._jobs = queue.Queue(maxsize=queue_size)
+        self._db_path = db_path
+        self.rejected = 0
+        self._posted = set()
+        self._posted_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="writer", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        svc = services.Services(open_connection(self._db_path, read_only=False))
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                break
+            func, future = job
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(func(svc))
+            except BaseException as e:
+                if svc.conn.in_transaction:
+                    svc.conn.rollback()
+                future.set_exception(e)
+        svc.conn.close()
+
+    def _enqueue(self, func):
+        future = Future()
+        try:
+            self._jobs.put_nowait((func, future))
+        except queue.Full:
+            self.rejected += 1
+            raise Overloaded("write queue full")
+        return future
+
+    def submit(self, func):
+        future = self._enqueue(func)
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeout:
+            # only a job that has not started can be dropped; one already
+            # running will commit, so wait for its real outcome rather than
+            # tell the client it failed and invite a duplicate retry
+            if future.cancel():
+                raise HttpError(504, "write timed out")
+            return future.result()
+
+    def post(self, key, func):
+        # fire and forget: nobody waits, a full queue just skips the job, and
+        # while a job for key is still pending another one is not queued
+        with self._posted_lock:
+            if key in self._posted:
+                return
+            self._posted.add(key)
+
+        def job(svc):
+            try:
+                return func(svc)
+            finally:
+                with self._posted_lock:
+                    self._posted.discard(key)
+
+        try:
+            self._enqueue(job)
+        except Overloaded:
+            with self._posted_lock:
+                self._posted.discard(key)
+
+    @property
+    def queued(self):
+        return self._jobs.qsize()
+
+    def close(self):
+        self._jobs.put(None)
+        self._thread.join()
+
+
+#   HELPERS
+def rows_json(rows):
+    return [dict(zip(row.keys(), row)) for row in rows]
+
+
+def page_json(listing, query):
+    try:
+        listing.page_size = max(1, min(int(query.get("limit", pager.PAGE_SIZE)), MAX_PAGE))
+        after = json.loads(query["after"]) if "after" in query else None
+    except ValueError:
+        raise HttpError(400, "bad limit or after")
+    if after is not None and (not isinstance(after, list) or len(after) != len(listing.columns)):
+        raise HttpError(400, "bad after")
+    rows = listing.page_after(after)
+    next_key = list(listing.key_of(rows[-1])) if rows and listing.has_next else None
+    return {"rows": rows_json(rows), "next": json.dumps(next_key) if next_key else None}
+
+
+def require(body, *fields):
+    missing = [f for f in fields if body.get(f) in (None, "")]
+    if missing:
+        raise HttpError(400, f"missing field(s): {', '.join(missing)}")
+    return [body[f] for f in fields]
+
+
+def as_int(value, what):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise HttpError(400, f"{what} must be an integer")
+
+
+#   ROUTE HANDLERS
+# handler(svc, user, args, query, body) -> JSON-able object
+def get_metrics(server):
+    def handler(svc, user, args, query, body):
+        return {
+            "read_connections": server.pool.size,
+            "read_rejected": server.pool.rejected,
+            "write_queued": server.writer.queued,
+            "write_rejected": server.writer.rejected,
+            "reference_cache": refcache.stats(),
+            "queries": {
+                name: {"calls": s.calls, "p50_ms": s.percentile(50) * 1000,
+                       "p95_ms": s.percentile(95) * 1000, "p99_ms": s.percentile(99) * 1000}
+                for name, s in queries.report()
+            },
+        }
+    return handler
+
+
+def get_stats(svc, user, args, query, body):
+    data, age = stats.get_statistics(svc.conn)
+    return {
+        "counts": dict(data["counts"]),
+        "by_department": rows_json(data["by_department"]),
+        "by_doctor": rows_json(data["by_doctor"]),
+        "low_stock": rows_json(data["low_stock"]),
+        "age_seconds": round(age, 1),
+    }
+
+
+def get_doctors(svc, user, args, query, body):
+    return page_json(svc.doctors.listing(), query)
+
+
+def get_free_slots(svc, user, args, query, body):
+    count = max(1, min(as_int(query.get("n", 5), "n"), MAX_PAGE))
+    return {"free_slots": svc.doctors.free_slots(int(args[0]), count)}
+
+
+def get_earliest_slot(svc, user, args, query, body):
+    days = max(1, min(as_int(query.get("days", 7), "days"), 366))
+    found = svc.doctors.earliest_slot(args[0], days)
+    return {"earliest": found._asdict() if found else None}
+
+
+def get_appointments(svc, user, args, query, body):
+    return page_json(svc.doctors.all_appointments(query.get("from"), query.get("to")), query)
+
+
+def get_my_appointments(svc, user, args, query, body):
+    if user["role"] == "doctor":
+        listing = svc.doctors.appointments(user["doctor_id"], query.get("from"), query.get("to"),
+                                           upcoming=query.get("upcoming") == "1")
+        return page_json(listing, query)
+    return page_json(svc.patients.appointments(user["patient_id"]), query)
+
+
+def get_my_prescriptions(svc, user, args, query, body):
+    if user["role"] == "doctor":
+        return page_json(svc.doctors.prescriptions(user["doctor_id"]), query)
+    return page_json(svc.patients.prescriptions(user["patient_id"]), query)
+
+
+def post_appointment(svc, user, args, query, body):
+    doctor_id, when = require(body, "doctor_id", "scheduled_datetime")
+    doctor_id = as_int(doctor_id, "doctor_id")
+    if user["role"] == "patient":
+        appointment_id = svc.patients.book_appointment(user["patient_id"], doctor_id, when)
+    else:
+        (ssn,) = require(body, "patient_ssn")
+        appointment_id = svc.patients.book_appointment_by_ssn(ssn, doctor_id, when)
+    return {"appointment_id": appointment_id}
+
+
+def get_prescription_medications(svc, user, args, query, body):
+    prescription_id = as_int(args[0], "prescription id")
+    if user["role"] == "patient":
+        contents = svc.patients.prescription_medications(user["patient_id"], prescription_id)
+    else:
+        contents = svc.pharmacy.prescription_medications(prescription_id)
+    rx = contents.prescription
+    return {"prescription_id": prescription_id, "prescriber_name": rx["prescriber_name"],
+            "dosage": rx["dosage"],
+            "medications": [{"medication_name": r["medication_name"],
+                             "quantity_in_stock": r["quantity_in_stock"],
+                             "location": r["location"]} for r in contents.medications]}
+
+
+def post_prescription(svc, user, args, query, body):
+    ssn, dosage = require(body, "patient_ssn", "dosage")
+    return {"prescription_id": svc.doctors.create_prescription(user["doctor_id"], ssn, dosage)}
+
+
+def post_prescription_medication(svc, user, args, query, body):
+    (name,) = require(body, "medication_name")
+    svc.pharmacy.add_medication(as_int(args[0], "prescription id"), name)
+    return {"ok": True}
+
+
+def get_pending(svc, user, args, query, body):
+    return page_json(svc.pharmacy.pending(), query)
+
+
+def post_dispense(svc, user, args, query, body):
+    (ids,) = require(body, "prescription_ids")
+    if not isinstance(ids, list):
+        raise HttpError(400, "prescription_ids must be a list")
+    dispensed, failed = svc.pharmacy.dispense_many(
+        user["pharmacist_id"], [as_int(i, "prescription id") for i in ids])
+    return {"dispensed": dispensed, "failed": [{"prescription_id": i, "reason": r} for i, r in failed]}
+
+
+def get_medications(svc, user, args, query, body):
+    return page_json(svc.pharmacy.medications(), query)
+
+
+def get_reorder(svc, user, args, query, body):
+    as_of = query.get("as_of")
+    if as_of:
+        try:
+            as_of = date.fromisoformat(as_of)
+        except ValueError:
+            raise HttpError(400, "as_of must look like YYYY-MM-DD")
+    return {"lines": [line._asdict() for line in svc.pharmacy.reorder_report(as_of or None)]}
+
+
+def get_low_stock(svc, user, args, query, body):
+    return page_json(svc.pharmacy.low_stock(), query)
+
+
+def get_medication(svc, user, args, query, body):
+    row = svc.pharmacy.medication(args[0])
+    if row is None:
+        raise HttpError(404, "Medication not found.")
+    return dict(zip(row.keys(), row))
+
+
+def put_medication(svc, user, args, query, body):
+    in_stock, ordered = require(body, "in_stock", "ordered")
+    threshold = body.get("reorder_threshold")
+    if threshold is not None:
+        threshold = as_int(threshold, "reorder_threshold")
+    svc.pharmacy.update_stock(args[0], as_int(in_stock, "in_stock"), as_int(ordered, "ordered"),
+                              threshold)
+    return {"ok": True}
+
+
+ANY = ("admin", "doctor", "patient", "pharmacist")
+
+
+def build_routes(server):
+    # (method, path pattern, handler, "read" | "write", allowed roles)
+    routes = [
+        ("GET", r"/metrics", get_metrics(server), "read", ("admin",)),
+        ("GET", r"/stats", get_stats, "read", ("admin",)),
+        ("GET", r"/doctors", get_doctors, "read", ANY),
+        ("GET", r"/doctors/(\d+)/free_slots", get_free_slots, "read", ANY),
+        ("GET", r"/departments/([^/]+)/earliest_slot", get_earliest_slot, "read", ANY),
+        ("GET", r"/appointments", get_appointments, "read", ("admin",)),
+        ("GET", r"/me/appointments", get_my_appointments, "read", ("patient", "doctor")),
+        ("GET", r"/me/prescriptions", get_my_prescriptions, "read", ("patient", "doctor")),
+        ("POST", r"/appointments", post_appointment, "write", ("patient", "admin")),
+        ("GET", r"/prescriptions/(\d+)/medications", get_prescription_medications, "read", ANY),
+        ("POST", r"/prescriptions", post_prescription, "write", ("doctor",)),
+        ("POST", r"/prescriptions/(\d+)/medications", post_prescription_medication, "write",
+         ("admin", "doctor")),
+        ("GET", r"/pending", get_pending, "read", ("pharmacist", "admin")),
+        ("POST", r"/dispense", post_dispense, "write", ("pharmacist",)),
+        ("GET", r"/medications", get_medications, "read", ("pharmacist", "admin")),
+        ("GET", r"/medications/reorder", get_reorder, "read", ("pharmacist", "admin")),
+        ("GET", r"/medications/low_stock", get_low_stock, "read", ("pharmacist", "admin")),
+        ("GET", r"/medications/([^/]+)", get_medication, "read", ("pharmacist", "admin")),
+        ("PUT", r"/medications/([^/]+)", put_medication, "write", ("pharmacist",)),
+    ]
+    return [(m, re.compile(p + "$"), h, kind, roles) for m, p, h, kind, roles in routes]
+
+
+#   HTTP
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "HospitalDB/1.0"
+    # headers and body go out as separate writes; without this every
+    # keep-alive response waits out the client's delayed ACK (~40 ms)
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def send_json(self, status, obj, headers=()):
+        data = json.dumps(obj).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def read_body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY:
+            raise HttpError(413, "request body too large")
+        if not length:
+            return {}
+        try:
+            body = json.loads(self.rfile.read(length))
+        except ValueError:
+            raise HttpError(400, "body must be JSON")
+        if not isinstance(body, dict):
+            raise HttpError(400, "body must be a JSON object")
+        return body
+
+    def authenticate(self, svc):
+        header = self.headers.get("Authorization", "")
+        if not header.startswith("Basic "):
+            return None
+        try:
+            username, _, password = base64.b64decode(header[6:]).decode("utf-8").partition(":")
+        except ValueError:
+            return None
+        user = svc.accounts.authenticate(username, password, rehash=False)
+        if user is not None and passwords.needs_rehash(user["password_hash"]):
+            # read connections are query_only, so the upgrade goes to the writer;
+            # it is not waited for, and a busy writer skips it until next login
+            self.server.writer.post(("rehash", user["user_id"]),
+                                    lambda wsvc: wsvc.accounts.rehash(user, password))
+        return user
+
+    def dispatch(self, method):
+        server = self.server
+        url = urlsplit(self.path)
+        path = unquote(url.path).rstrip("/") or "/"
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+
+        try:
+            body = self.read_body()
+            if method == "GET" and path == "/health":
+                self.send_json(200, {"ok": True})
+                return
+
+            route = None
+            allowed = False
+            for m, pattern, handler, kind, roles in server.routes:
+                match = pattern.match(path)
+                if match:
+                    allowed = True
+                    if m == method:
+                        route = (handler, kind, roles, match.groups())
+                        break
+            if route is None:
+                raise HttpError(405 if allowed else 404, "no such route")
+            handler, kind, roles, args = route
+
+            with server.pool.reading() as svc:
+                user = self.authenticate(svc)
+                if user is None:
+                    self.send_json(401, {"error": "login required"},
+                                   [("WWW-Authenticate", 'Basic realm="hospital"')])
+                    return
+                if user["role"] not in roles:
+                    raise HttpError(403, "not allowed for this role")
+                if kind == "read":
+                    result = handler(svc, user, args, query, body)
+
+            if kind == "write":
+                result = server.writer.submit(lambda wsvc: handler(wsvc, user, args, query, body))
+
+            self.send_json(200, result)
+        except Overloaded as e:
+            self.send_json(503, {"error": f"server busy: {e}"}, [("Retry-After", "1")])
+        except HttpError as e:
+            self.send_json(e.status, {"error": str(e)})
+        except services.ServiceError as e:
+            self.send_json(400, {"error": str(e)})
+        except sqlite3.OperationalError as e:
+            # e.g. "database is locked" from a process outside this server
+            self.send_json(503, {"error": str(e)}, [("Retry-After", "1")])
+        except Exception:
+            traceback.print_exc()
+            self.send_json(500, {"error": "internal error"})
+
+    def do_GET(self):
+        self.dispatch("GET")
+
+    def do_POST(self):
+        self.dispatch("POST")
+
+    def do_PUT(self):
+        self.dispatch("PUT")
+
+
+class HospitalServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, address, db_path, settings, verbose=False):
+        timeout = float(settings["request_timeout"])
+        self.pool = ReadPool(db_path, int(settings["read_connections"]),
+                             int(settings["read_backlog"]), timeout)
+        self.writer = Writer(db_path, int(settings["write_queue"]), timeout)
+        self.routes = build_routes(self)
+        self.verbose = verbose
+        super().__init__(address, Handler)
+
+    def server_close(self):
+        super().server_close()
+        self.writer.close()
+        self.pool.close()
+
+
+def main():
+    args = sys.argv[1:]
+    settings = load_settings()
+    host = args[args.index("--host") + 1] if "--host" in args else settings["host"]
+    port = int(args[args.index("--port") + 1]) if "--port" in args else int(settings["port"])
+    db_path = args[args.index("--db") + 1] if "--db" in args else DB_PATH
+
+    monitor.configure()
+    passwords.configure()
+    server = HospitalServer((host, port), db_path, settings, verbose="--verbose" in args)
+    print(f"Serving {db_path} on http://{host}:{port} "
+          f"({settings['read_connections']} readers, 1 writer)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down.")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,643 @@
+#SJSU CMPE 138 FALL 2025 TEAM6
+# Service layer: every operation the menus offer, without input()/print().
+#
+# Methods take typed arguments and return sqlite3.Row objects, small
+# namedtuples for screens that show a record with its children, or a pager.KeysetPager for
+# listings (call first()/next(rows) on it). A request that cannot be carried
+# out raises ServiceError with a message meant for the user; anything else is
+# a bug and propagates. Each write method is its own transaction, so it must
+# not be called while the connection already has one open.
+#
+#   svc = services.Services(conn)
+#   patient_id = svc.patients.find("111-22-3333", "John Doe")
+#   svc.patients.book_appointment(patient_id, 1, "2025-05-01 09:00:00")
+#   page = svc.doctors.listing().first()
+import difflib
+import json
+import re
+import sqlite3
+import string
+from collections import namedtuple
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+
+import pager
+import passwords
+import queries
+import refcache
+import schedule
+import stats
+
+ROLES = ("patient", "doctor", "pharmacist", "admin")
+# reorder forecast: moving-average windows in days, and the days of cover
+# below which a medication is flagged for reordering
+USE_WINDOWS = (7, 28)
+REORDER_COVER_DAYS = 14
+# search screens: rows shown, matches ranked to pick them, and how close
+# (difflib ratio) a word must be to count as a misspelling of it
+SEARCH_LIMIT = 10
+SEARCH_CANDIDATES = 1000
+SEARCH_SIMILARITY = 0.75
+
+DepartmentDetails = namedtuple("DepartmentDetails", "department doctors")
+PharmacyDetails = namedtuple("PharmacyDetails", "pharmacy pharmacists")
+PharmacistDetails = namedtuple("PharmacistDetails", "pharmacist roles medications")
+Availability = namedtuple("Availability", "doctor_id name department_name earliest")
+PrescriptionContents = namedtuple("PrescriptionContents", "prescription medications")
+ReorderLine = namedtuple("ReorderLine",
+                         "name in_stock ordered location daily_short daily_long days_of_cover reorder")
+
+
+class ServiceError(Exception):
+    pass
+
+
+class DispenseError(ServiceError):
+    pass
+
+
+@contextmanager
+def transaction(conn):
+    # IMMEDIATE takes the write lock up front, so a writer never fails half
+    # way through with SQLITE_BUSY after its reads
+    conn.execute("BEGIN IMMEDIATE;")
+    try:
+        yield conn
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    stats.invalidate(conn)
+
+
+def prescription_contents(rows):
+    # rows of "prescription.contents" carry the prescription on every row
+    return PrescriptionContents(rows[0], [r for r in rows if r["medication_name"] is not None])
+
+
+def search_words(text):
+    # the words FTS5 would index for text (unicode61 splits on anything that
+    # is not a letter or digit)
+    return re.findall(r"[^\W_]+", text.lower())
+
+
+def spelling_prefixes(word):
+    # where to look for indexed words close to a misspelt one: those with its
+    # first letter, and those with its second letter after any other first
+    # one (a wrong or swapped first letter)
+    alphabet = string.digits if word.isdigit() else string.ascii_lowercase
+    return [word[0]] + [c + word[1] for c in alphabet if c != word[0]]
+
+
+class Session:
+    # The logged-in user with their patient (insurance, primary care doctor),
+    # doctor or pharmacist profile, all from the one "session.identity" row
+    # read at login. Menus read it here instead of re-querying; a write made
+    # through this session's services that changes any of it re-reads it
+    # (Service.changed).
+    def __init__(self, conn, row):
+        self.conn = conn
+        self.load(row)
+
+    def load(self, row):
+        self.row = row
+        self.insurance = json.loads(row["insurance"])
+
+    def __getitem__(self, key):
+        return self.row[key]
+
+    def covers(self, kind, key):
+        # kind: "patient", "doctor" or "pharmacist"
+        return key is not None and self.row[f"{kind}_id"] == key
+
+    def refresh(self):
+        self.load(queries.fetch_one(self.conn, "session.identity", (self.row["username"],)))
+
+
+class Service:
+    # set by Services.login() for the logged-in user's session
+    session = None
+
+    def __init__(self, conn):
+        if conn.row_factory is None:
+            conn.row_factory = sqlite3.Row
+        self.conn = conn
+
+    def changed(self, kind, key):
+        # after a committed write to that patient/doctor/pharmacist
+        if self.session is not None and self.session.covers(kind, key):
+            self.session.refresh()
+
+    def one(self, name, params=()):
+        return refcache.run(self.conn, name, params, "one")
+
+    def all(self, name, params=()):
+        return refcache.run(self.conn, name, params, "all")
+
+    def run(self, name, params=()):
+        return queries.run(self.conn, name, params)
+
+    def paged(self, name, params=(), page_size=None):
+        return pager.KeysetPager(self.conn, name, params, page_size)
+
+    def ranked_search(self, name, terms, text, limit):
+        # FTS5 search (migration 011) where every word matches the start of
+        # an indexed word. If that finds nothing, a word that starts no
+        # indexed word at all is taken as misspelt and replaced by the
+        # closest indexed words sharing its first or second letter and with
+        # a length within two of it, so "jhon", "kohn" and "amoxcilin" are
+        # still found.
+        words = search_words(text)
+        if not words:
+            raise ServiceError("Enter a name or number to search for.")
+
+        def run(groups):
+            return self.all(name, (" AND ".join(groups), SEARCH_CANDIDATES, limit))
+
+        groups = [f'"{w}"*' for w in words]
+        rows = run(groups)
+        if rows:
+            return rows
+
+        corrected = False
+        for i, word in enumerate(words):
+            if len(word) < 3 or self.all(name, (groups[i], 1, 1)):
+                continue
+            known = [r["term"] for r in self.all(terms, (json.dumps(spelling_prefixes(word)),
+                                                          len(word) - 2, len(word) + 2))]
+            close = difflib.get_close_matches(word, known, n=3, cutoff=SEARCH_SIMILARITY)
+            if not close:
+                return []
+            groups[i] = "(" + " OR ".join(f'"{t}"' for t in close) + ")"
+            corrected = True
+        return run(groups) if corrected else []
+
+
+#   ACCOUNTS
+class AccountService(Service):
+    def user(self, username: str):
+        return self.one("user.by_username", (username,))
+
+    def authenticate(self, username: str, password: str, rehash: bool = True):
+        # rehash=False for query_only connections; the caller then upgrades
+        # the hash itself when passwords.needs_rehash() says so
+        user = self.user(username)
+        if user is None or not passwords.check(user["user_id"], password, user["password_hash"]):
+            return None
+        if rehash and passwords.needs_rehash(user["password_hash"]):
+            self.rehash(user, password)
+        return user
+
+    def login(self, username: str, password: str):
+        # authenticate() and the session profile in one query; a Session or None
+        row = self.one("session.identity", (username,))
+        if row is None or not passwords.check(row["user_id"], password, row["password_hash"]):
+            return None
+        if passwords.needs_rehash(row["password_hash"]):
+            self.rehash(row, password)
+        return Session(self.conn, row)
+
+    def rehash(self, user, password: str):
+        # matching on the old hash lets a concurrent password change win
+        with transaction(self.conn):
+            self.run("user.rehash", (passwords.hash_password(password),
+                                     user["user_id"], user["password_hash"]))
+        passwords.forget(user["user_id"])
+
+    def change_password(self, username: str, old_password: str, new_password: str):
+        user = self.authenticate(username, old_password, rehash=False)
+        if user is None:
+            raise ServiceError("Invalid username or password.")
+        if not new_password:
+            raise ServiceError("Password cannot be empty.")
+        with transaction(self.conn):
+            self.run("user.set_password", (passwords.hash_password(new_password), user["user_id"]))
+        passwords.forget(user["user_id"])
+
+    def register(self, username: str, password: str, role: str,
+                 patient_id: int = None, doctor_id: int = None, pharmacist_id: int = None):
+        # only the link that matches the role is kept
+        if role not in ROLES:
+            raise ServiceError("Invalid role.")
+        if self.user(username):
+            raise ServiceError("That username already exists.")
+
+        if role == "patient":
+            if patient_id is None or not self.one("patient.exists", (patient_id,)):
+                raise ServiceError("No such patient exists.")
+        elif role == "doctor":
+            if not self.one("doctor.exists", (doctor_id,)):
+                raise ServiceError("No such doctor.")
+        elif role == "pharmacist":
+            if not self.one("pharmacist.exists", (pharmacist_id,)):
+                raise ServiceError("No such pharmacist.")
+
+        with transaction(self.conn):
+            cur = self.run("user.insert", (
+                username, passwords.hash_password(password), role,
+                patient_id if role == "patient" else None,
+                doctor_id if role == "doctor" else None,
+                pharmacist_id if role == "pharmacist" else None,
+            ))
+        return cur.lastrowid
+
+
+#   PATIENTS
+class PatientService(Service):
+    def listing(self):
+        return self.paged("patient.list")
+
+    def exists(self, patient_id: int) -> bool:
+        return self.one("patient.exists", (patient_id,)) is not None
+
+    def find(self, ssn: str, name: str = None):
+        # patient_id for the SSN, or None; a name, if given, has to match too
+        row = self.one("patient.by_ssn", (ssn,))
+        if row is None or (name is not None and row["name"] != name):
+            return None
+        return row["patient_id"]
+
+    def search(self, text: str, limit: int = SEARCH_LIMIT):
+        # by any part of the name, phone number or city
+        return self.ranked_search("search.patients", "search.patient_terms", text, limit)
+
+    def info(self, patient_id: int):
+        return self.one("patient.info", (patient_id,))
+
+    def insurance(self, patient_id: int):
+        return self.all("patient.insurance", (patient_id,))
+
+    def primary_care(self, patient_id: int):
+        return self.one("patient.primary_care", (patient_id,))
+
+    def appointments(self, patient_id: int, history: bool = False):
+        listing = "patient.appointment_history" if history else "patient.appointments"
+        return self.paged(listing, (patient_id,))
+
+    def prescriptions(self, patient_id: int):
+        return self.paged("patient.prescriptions", (patient_id,))
+
+    def prescriptions_by_ssn(self, ssn: str):
+        return self.paged("prescription.by_patient_ssn", (ssn,))
+
+    def prescription_medications(self, patient_id: int, prescription_id: int):
+        rows = self.all("prescription.contents", (prescription_id,))
+        if not rows or rows[0]["patient_id"] != patient_id:
+            raise ServiceError("Prescription not found or does not belong to you.")
+        return prescription_contents(rows)
+
+    def book_appointment(self, patient_id: int, doctor_id: int, scheduled_datetime: str) -> int:
+        if not self.one("doctor.exists", (doctor_id,)):
+            raise ServiceError("Invalid doctor ID.")
+        try:
+            start, end = schedule.normalize(scheduled_datetime)
+        except ValueError as e:
+            raise ServiceError(str(e))
+        try:
+            # the slot trigger makes a double booking fail this very INSERT
+            with transaction(self.conn):
+                cur = self.run("appointment.insert", (patient_id, doctor_id, start, end))
+        except sqlite3.IntegrityError as e:
+            if "Appointment_slot" in str(e):
+                raise ServiceError(f"Doctor {doctor_id} is already booked at {start}.")
+            raise ServiceError(f"Could not book appointment: {e}")
+        return cur.lastrowid
+
+    def book_appointment_by_ssn(self, ssn: str, doctor_id: int, scheduled_datetime: str) -> int:
+        patient_id = self.find(ssn)
+        if patient_id is None:
+            raise ServiceError("No patient found with that SSN.")
+        return self.book_appointment(patient_id, doctor_id, scheduled_datetime)
+
+    def assign_primary_care(self, patient_id: int, doctor_id: int):
+        if not self.exists(patient_id):
+            raise ServiceError("Patient not found.")
+        if not self.one("primary_care.exists", (doctor_id,)):
+            raise ServiceError("Doctor is not registered as a primary care physician.")
+        with transaction(self.conn):
+            self.run("patient.assign_primary_care", (doctor_id, patient_id))
+        self.changed("patient", patient_id)
+
+
+#   DOCTORS AND DEPARTMENTS
+class DoctorService(Service):
+    def listing(self):
+        return self.paged("doctor.list")
+
+    def search(self, text: str, limit: int = SEARCH_LIMIT):
+        # by any part of the name or department
+        return self.ranked_search("search.doctors", "search.doctor_terms", text, limit)
+
+    def specialists(self):
+        return self.paged("doctor.specialists")
+
+    def primary_care_doctors(self):
+        return self.paged("doctor.primary_care")
+
+    def choices(self):
+        return self.all("doctor.choices")
+
+    def appointments(self, doctor_id: int, first_day: str = None, last_day: str = None,
+                     upcoming: bool = False):
+        # all of them, upcoming only, or those on first_day..last_day (YYYY-MM-DD)
+        if first_day or last_day:
+            return self.paged("doctor.appointments_between",
+                              (doctor_id,) + self._day_range(first_day, last_day))
+        if upcoming:
+            return self.paged("doctor.upcoming", (doctor_id,))
+        return self.paged("doctor.appointments", (doctor_id,))
+
+    def all_appointments(self, first_day: str = None, last_day: str = None):
+        if first_day or last_day:
+            return self.paged("appointment.between", self._day_range(first_day, last_day))
+        return self.paged("appointment.list")
+
+    def _day_range(self, first_day, last_day):
+        try:
+            return schedule.day_range(first_day or "", last_day or first_day or "")
+        except ValueError as e:
+            raise ServiceError(str(e))
+
+    def prescriptions(self, doctor_id: int):
+        return self.paged("doctor.prescriptions", (doctor_id,))
+
+    def free_slots(self, doctor_id: int, count: int = 5, after: datetime = None):
+        # a week at a time, each week one range scan of the (doctor_id, slot)
+        # key, so only the weeks up to the N-th free slot are ever read
+        if not self.one("doctor.exists", (doctor_id,)):
+            raise ServiceError("Invalid doctor ID.")
+        lo = schedule.next_bookable(after or datetime.now())
+        free = []
+        for _ in range(schedule.SEARCH_WEEKS):
+            hi = lo + schedule.SLOTS_PER_WEEK
+            taken = {r["slot"] for r in self.all("slot.taken", (doctor_id, lo, hi))}
+            free.extend(s for s in schedule.bookable(lo, hi) if s not in taken)
+            if len(free) >= count:
+                break
+            lo = schedule.next_bookable(schedule.slot_start(hi))
+        return [schedule.slot_start(s).strftime(schedule.FORMAT) for s in free[:count]]
+
+    def availability(self, department: str = None, days: int = 7, after: datetime = None):
+        # earliest free slot per doctor in the next `days` days: the doctors
+        # come from the cached doctor.choices listing, their Doctor_day
+        # bitmaps from one query, then a lowest-clear-bit per day
+        lo = schedule.next_bookable(after or datetime.now())
+        first_day = schedule.slot_start(lo).date()
+        skip = lo - schedule.first_slot_of_day(first_day)
+        params = (first_day.isoformat(), (first_day + timedelta(days=days)).isoformat())
+        doctors = self.choices()
+        if department is None:
+            rows = self.all("doctor.busy_days", params)
+        else:
+            doctors = [d for d in doctors if d["department_name"] == department]
+            rows = self.all("department.busy_days", params + (department,))
+        busy = {(r["doctor_id"], r["day"]): r["busy"] for r in rows}
+
+        result = []
+        for d in doctors:
+            earliest = None
+            for offset in range(days):
+                day = first_day + timedelta(days=offset)
+                index = schedule.earliest_free(busy.get((d["id"], day.isoformat()), 0),
+                                               skip if offset == 0 else 0)
+                if index is not None:
+                    slot = schedule.first_slot_of_day(day) + index
+                    earliest = schedule.slot_start(slot).strftime(schedule.FORMAT)
+                    break
+            result.append(Availability(d["id"], d["name"], d["department_name"], earliest))
+        result.sort(key=lambda a: (a.name, a.doctor_id))
+        return result
+
+    def earliest_slot(self, department: str, days: int = 7, after: datetime = None):
+        # the Availability with the soonest free slot in the department, or None
+        free = [a for a in self.availability(department, days, after) if a.earliest]
+        return min(free, key=lambda a: (a.earliest, a.name), default=None)
+
+    def create_prescription(self, doctor_id: int, patient_ssn: str, dosage: str) -> int:
+        patient = self.one("patient.by_ssn", (patient_ssn,))
+        if patient is None:
+            raise ServiceError("No such patient.")
+        if not dosage:
+            raise ServiceError("Dosage instructions are required.")
+
+        with transaction(self.conn):
+            cur = self.run("prescription.insert", (doctor_id, patient["patient_id"], dosage))
+            # queue it for the pharmacy in the same transaction
+            self.run("pending.enqueue", (cur.lastrowid,))
+        return cur.lastrowid
+
+    def departments(self):
+        return self.paged("department.list")
+
+    def department(self, name: str):
+        row = self.one("department.details", (name,))
+        if row is None:
+            return None
+        return DepartmentDetails(row, self.all("department.doctors", (name,)))
+
+    def create_department(self, name: str):
+        if not name:
+            raise ServiceError("Department name cannot be empty.")
+        try:
+            with transaction(self.conn):
+                self.run("department.insert", (name,))
+        except sqlite3.IntegrityError:
+            raise ServiceError(f"Department '{name}' already exists.")
+
+
+#   PHARMACY, MEDICATIONS AND DISPENSING
+class PharmacyService(Service):
+    def pharmacies(self):
+        return self.paged("pharmacy.list")
+
+    def pharmacy(self, city: str, street: str):
+        row = self.one("pharmacy.details", (city, street))
+        if row is None:
+            return None
+        return PharmacyDetails(row, self.all("pharmacy.pharmacists", (city, street)))
+
+    def create_pharmacy(self, street: str, city: str, state: str, zip_code: str, telephone: str):
+        if not all([street, city, state, zip_code, telephone]):
+            raise ServiceError("All fields are required.")
+        try:
+            with transaction(self.conn):
+                self.run("pharmacy.insert", (street, city, state, zip_code, telephone))
+        except sqlite3.IntegrityError:
+            raise ServiceError("This pharmacy already exists.")
+
+    def pharmacist(self, pharmacist_id: int):
+        row = self.one("pharmacist.profile", (pharmacist_id,))
+        if row is None:
+            return None
+
+        roles = []
+        if row["is_dispenser"]:
+            roles.append("Dispenser")
+        medications = []
+        if row["is_inventory_manager"]:
+            roles.append("Inventory Manager")
+            medications = sorted(json.loads(row["managed_medications"]))
+        return PharmacistDetails(row, roles, medications)
+
+    def medications(self):
+        return self.paged("medication.list")
+
+    def medication(self, name: str):
+        return self.one("medication.by_name", (name,))
+
+    def search_medications(self, text: str, limit: int = SEARCH_LIMIT):
+        # by any part of the name or storage location
+        return self.ranked_search("search.medications", "search.medication_terms", text, limit)
+
+    def update_stock(self, name: str, in_stock: int, ordered: int, threshold: int = None):
+        # threshold: new reorder threshold, or None to keep the current one
+        if in_stock <= 0 or ordered <= 0:
+            raise ServiceError("Quantities must be positive.")
+        if ordered >= in_stock:
+            raise ServiceError("Ordered quantity must be less than in-stock quantity.")
+        if threshold is not None and threshold < 0:
+            raise ServiceError("Reorder threshold cannot be negative.")
+        with transaction(self.conn):
+            self.run("stock.record_adjustment", (in_stock, name, in_stock))
+            updated = self.run("medication.update_stock", (in_stock, ordered, name)).rowcount
+            if updated and threshold is not None:
+                self.run("medication.set_threshold", (threshold, name))
+        if not updated:
+            raise ServiceError("Medication not found.")
+
+    def low_stock(self):
+        return self.paged("stock.alerts")
+
+    def stock_history(self, name: str):
+        return self.paged("stock.history", (name,))
+
+    def reorder_report(self, as_of: date = None):
+        # Days of cover per medication from the daily use totals of the last
+        # USE_WINDOWS days up to as_of. The higher of the two moving averages
+        # is used, so a recent rise in demand shows up straight away. Only
+        # stock above quantity_ordered + 1 can be dispensed, so that is what
+        # is covered. Lowest cover first; no recent use sorts last.
+        short, long_ = USE_WINDOWS
+        end = (as_of or date.today()) + timedelta(days=1)
+        params = ((end - timedelta(days=short)).isoformat(),
+                  (end - timedelta(days=long_)).isoformat(), end.isoformat())
+
+        lines = []
+        for r in self.all("stock.reorder", params):
+            daily_short = r["used_short"] / short
+            daily_long = r["used_long"] / long_
+            rate = max(daily_short, daily_long)
+            usable = max(r["quantity_in_stock"] - r["quantity_ordered"] - 1, 0)
+            cover = usable / rate if rate else None
+            lines.append(ReorderLine(
+                r["name"], r["quantity_in_stock"], r["quantity_ordered"], r["location"],
+                daily_short, daily_long, cover,
+                cover is not None and cover < REORDER_COVER_DAYS,
+            ))
+        lines.sort(key=lambda l: (l.days_of_cover is None, l.days_of_cover or 0, l.name))
+        return lines
+
+    def prescription_medications(self, prescription_id: int):
+        rows = self.all("prescription.contents", (prescription_id,))
+        if not rows:
+            raise ServiceError("Prescription not found.")
+        return prescription_contents(rows)
+
+    def add_medication(self, prescription_id: int, medication_name: str):
+        if not self.one("prescription.exists", (prescription_id,)):
+            raise ServiceError("Prescription not found.")
+        if not self.one("medication.exists", (medication_name,)):
+            raise ServiceError("Medication not found.")
+        try:
+            with transaction(self.conn):
+                self.run("prescription.add_medication", (prescription_id, medication_name))
+        except sqlite3.IntegrityError:
+            raise ServiceError("This medication is already linked to this prescription.")
+
+    def remove_medication(self, prescription_id: int, medication_name: str):
+        with transaction(self.conn):
+            removed = self.run("prescription.remove_medication",
+                               (prescription_id, medication_name)).rowcount
+        if not removed:
+            raise ServiceError("No matching medication found in prescription.")
+
+    def pending(self):
+        return self.paged("pending.list")
+
+    def pending_ids(self):
+        return [r["prescription_id"] for r in self.all("pending.all_ids")]
+
+    def _dispense(self, pharmacist_id, prescription_id):
+        # Runs inside an open transaction. Four statements whatever the
+        # number of medications; any failure raises and the caller rolls back.
+
+        # Claim the prescription: only one terminal can remove it from the queue
+        if not self.run("dispense.claim", (prescription_id,)).rowcount:
+            raise DispenseError(f"Prescription {prescription_id} not found or already dispensed.")
+
+        # Record the dispense (only if the pharmacist is a dispenser) and get
+        # back how many medications the prescription contains
+        row = self.all("dispense.record", (prescription_id, pharmacist_id))
+        if not row:
+            raise DispenseError("You are not registered as a dispenser.")
+
+        med_count = row[0]["med_count"]
+        if med_count == 0:
+            raise DispenseError(f"No medications linked to prescription {prescription_id}.")
+
+        # Decrement every medication at once; the guard keeps the Medication
+        # CHECK constraints true, so a short item is simply not updated
+        updated = self.run("dispense.decrement_stock", (prescription_id,)).rowcount
+        if updated != med_count:
+            raise DispenseError(f"Not enough stock to dispense prescription {prescription_id}.")
+
+        # and the matching ledger rows, which also feed Medication_daily_use
+        self.run("stock.record_dispense", (prescription_id,))
+
+    def dispense(self, pharmacist_id: int, prescription_id: int):
+        with transaction(self.conn):
+            self._dispense(pharmacist_id, prescription_id)
+
+    def dispense_many(self, pharmacist_id: int, prescription_ids):
+        # One transaction for the whole batch; each prescription gets a
+        # savepoint so a short one is skipped without undoing the others.
+        # Returns ([dispensed ids], [(id, reason), ...]).
+        dispensed = []
+        failed = []
+        with transaction(self.conn):
+            for prescription_id in prescription_ids:
+                self.conn.execute("SAVEPOINT dispense_one;")
+                try:
+                    self._dispense(pharmacist_id, prescription_id)
+                    self.conn.execute("RELEASE dispense_one;")
+                    dispensed.append(prescription_id)
+                except (DispenseError, sqlite3.IntegrityError) as e:
+                    self.conn.execute("ROLLBACK TO dispense_one;")
+                    self.conn.execute("RELEASE dispense_one;")
+                    failed.append((prescription_id, str(e)))
+        return dispensed, failed
+
+
+class Services:
+    # the four services over one connection
+    def __init__(self, conn):
+        self.conn = conn
+        self.accounts = AccountService(conn)
+        self.patients = PatientService(conn)
+        self.doctors = DoctorService(conn)
+        self.pharmacy = PharmacyService(conn)
+        self.session = None
+
+    def login(self, username: str, password: str):
+        # the Session for these credentials, or None; the services keep it
+        # current until logout()
+        self.set_session(self.accounts.login(username, password))
+        return self.session
+
+    def logout(self):
+        self.set_session(None)
+
+    def set_session(self, session):
+        self.session = session
+        for service in (self.accounts, self.patients, self.doctors, self.pharmacy):
+            service.session = session
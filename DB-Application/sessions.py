@@ -0,0 +1,208 @@
+#SJSU CMPE 138 FALL 2025 TEAM6
+# Terminal sessions over a socket, so several desks can run the app.py menus
+# against one schema.db at the same time.
+#
+#   python sessions.py [--host 127.0.0.1] [--port 8139] [--db PATH]
+#   python sessions.py --unix /tmp/hospital.sock
+#
+#   nc 127.0.0.1 8139            (or: nc -U /tmp/hospital.sock)
+#
+# One asyncio loop accepts connections and does all of the socket reads and
+# writes. Every session gets its own single-thread executor: the menus and
+# every query they make run on that thread, on a connection opened there and
+# used by nothing else. A long listing or report only holds up its own
+# session; the loop keeps serving everybody else, and other sessions' logins
+# and dispenses run on their own threads (sqlite3 releases the GIL while a
+# statement runs). The menus still just print() and input(); sys.stdout and
+# sys.stdin are routed per thread to the session that owns it.
+#
+# Limits come from the [sessions] section of db_config.ini.
+import asyncio
+import io
+import sys
+import threading
+import traceback
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+from contextlib import closing
+
+import app
+import connection
+import monitor
+import passwords
+import services
+
+DEFAULTS = {
+    "host": "127.0.0.1",
+    "port": "8139",
+    "unix_socket": "",
+    "max_sessions": "32",
+    "idle_timeout": "900",       # seconds a session may wait at a prompt
+}
+
+_session = threading.local()
+
+
+def load_settings():
+    config = connection.load_config()
+    section = config["sessions"] if config.has_section("sessions") else {}
+    return {key: section.get(key, default) for key, default in DEFAULTS.items()}
+
+
+#   PER-THREAD CONSOLE
+class Routed:
+    # stands in for sys.stdout / sys.stdin: session threads talk to their
+    # socket, every other thread to the real console
+    def __init__(self, default):
+        self.default = default
+
+    def target(self):
+        return getattr(_session, "io", None) or self.default
+
+    def write(self, text):
+        return self.target().write(text)
+
+    def flush(self):
+        return self.target().flush()
+
+    def readline(self, *args):
+        return self.target().readline()
+
+    def fileno(self):
+        # input() only uses the terminal's line editor when this succeeds
+        return self.target().fileno()
+
+    def isatty(self):
+        return self.target().isatty()
+
+    def __getattr__(self, name):
+        return getattr(self.default, name)
+
+
+class SessionIO:
+    # called from the session thread; the stream itself belongs to the loop
+    def __init__(self, loop, reader, writer, idle_timeout):
+        self.loop = loop
+        self.reader = reader
+        self.writer = writer
+        self.idle_timeout = idle_timeout
+
+    def call(self, coro):
+        if self.loop.is_closed():
+            coro.close()
+            raise ConnectionResetError("server shut down")
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+    def write(self, text):
+        if self.loop.is_closed():
+            raise ConnectionResetError("server shut down")
+        self.loop.call_soon_threadsafe(self.writer.write, text.encode("utf-8"))
+        return len(text)
+
+    def flush(self):
+        # input() flushes before reading; waiting for the drain here is what
+        # keeps a slow client from buffering without limit
+        self.call(self.writer.drain())
+
+    def readline(self):
+        line = self.call(asyncio.wait_for(self.reader.readline(), self.idle_timeout))
+        return line.decode("utf-8", "replace").replace("\r\n", "\n")
+
+    def fileno(self):
+        raise io.UnsupportedOperation("session socket")
+
+    def isatty(self):
+        return False
+
+
+def run_session(session_io, db_path):
+    _session.io = session_io
+    try:
+        with closing(app.get_connection(db_path)) as conn:
+            app.welcome(services.Services(conn))
+    except TimeoutError:
+        try:
+            print("\nSession timed out.")
+        except (ConnectionError, CancelledError):
+            pass
+    except (EOFError, ConnectionError, CancelledError):
+        # client hung up or the server is stopping
+        pass
+    except Exception:
+        # goes to the server's stderr, which is not routed
+        traceback.print_exc()
+    finally:
+        _session.io = None
+
+
+#   SERVER
+class SessionServer:
+    def __init__(self, db_path, settings):
+        self.db_path = db_path
+        self.max_sessions = int(settings["max_sessions"])
+        self.idle_timeout = float(settings["idle_timeout"])
+        self.active = 0
+        self.opened = 0
+
+    async def handle(self, reader, writer):
+        # runs on the loop, so the counters need no lock
+        if self.active >= self.max_sessions:
+            writer.write(b"Too many sessions, try again later.\n")
+            await self.hang_up(writer)
+            return
+
+        self.active += 1
+        self.opened += 1
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"session-{self.opened}")
+        loop = asyncio.get_running_loop()
+        session_io = SessionIO(loop, reader, writer, self.idle_timeout)
+        try:
+            await loop.run_in_executor(executor, run_session, session_io, self.db_path)
+        finally:
+            self.active -= 1
+            executor.shutdown(wait=False)
+            await self.hang_up(writer)
+
+    async def hang_up(self, writer):
+        try:
+            await writer.drain()
+            writer.close()
+            await writer.wait_closed()
+        except ConnectionError:
+            pass
+
+    async def serve(self, host, port, unix_socket):
+        if unix_socket:
+            server = await asyncio.start_unix_server(self.handle, path=unix_socket)
+            where = unix_socket
+        else:
+            server = await asyncio.start_server(self.handle, host, port)
+            where = f"{host}:{port}"
+        print(f"Serving sessions on {where} for {self.db_path} (at most {self.max_sessions})")
+        async with server:
+            await server.serve_forever()
+
+
+def main():
+    args = sys.argv[1:]
+    settings = load_settings()
+
+    def option(flag, default):
+        return args[args.index(flag) + 1] if flag in args else default
+
+    host = option("--host", settings["host"])
+    port = int(option("--port", settings["port"]))
+    unix_socket = option("--unix", settings["unix_socket"])
+    db_path = option("--db", app.DB_PATH)
+
+    monitor.configure()
+    passwords.configure()
+    sys.stdout = Routed(sys.stdout)
+    sys.stdin = Routed(sys.stdin)
+    try:
+        asyncio.run(SessionServer(db_path, settings).serve(host, port, unix_socket))
+    except KeyboardInterrupt:
+        print("\nShutting down.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+#SJSU CMPE 138 FALL 2025 TEAM6
+# System statistics for the admin dashboard.
+#
+# Totals come from Entity_count and the per-doctor numbers from
+# Doctor_activity, both kept current by triggers (migration 003), so building
+# the dashboard never scans Patient/Appointment/Prescription. The result is
+# cached in-process per database file for CACHE_TTL seconds on top of that;
+# every write committed through services.transaction() drops the entry for
+# its database, so only writes from other processes can leave it stale.
+import time
+
+import queries
+
+CACHE_TTL = 30.0
+TOP_DOCTORS = 10
+
+ENTITY_LABELS = [
+    ("Patient", "Patients"),
+    ("Doctor", "Doctors"),
+    ("Appointment", "Appointments"),
+    ("Prescription", "Prescriptions"),
+    ("Department", "Departments"),
+    ("Pharmacy", "Pharmacies"),
+    ("Pharmacist", "Pharmacists"),
+    ("Medication", "Medications"),
+    ("User_Account", "Users"),
+]
+
+# database file -> (stats, loaded_at)
+_cache = {}
+
+
+def load_statistics(conn):
+    counts = dict(queries.fetch_all(conn, "stats.entity_counts"))
+
+    return {
+        "counts": [(label, counts.get(entity, 0)) for entity, label in ENTITY_LABELS],
+        "by_department": queries.fetch_all(conn, "stats.by_department"),
+        "by_doctor": queries.fetch_all(conn, "stats.top_doctors", (TOP_DOCTORS,)),
+        "low_stock": queries.fetch_all(conn, "stats.low_stock"),
+    }
+
+
+def db_file(conn):
+    return queries.fetch_one(conn, "stats.db_file")[0]
+
+
+def get_statistics(conn, ttl=CACHE_TTL):
+    key = db_file(conn)
+    now = time.monotonic()
+    entry = _cache.get(key)
+    if entry is None or now - entry[1] > ttl:
+        entry = (load_statistics(conn), now)
+        _cache[key] = entry
+    return entry[0], now - entry[1]
+
+
+def invalidate(conn):
+    _cache.pop(db_file(conn), None)
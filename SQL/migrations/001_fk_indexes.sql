@@ -0,0 +1,50 @@
+--SJSU CMPE 138 FALL 2025 TEAM6 
+-- Secondary indexes for the foreign key / lookup columns used by app.py.
+-- Safe to run against an existing schema.db (IF NOT EXISTS everywhere).
+
+CREATE INDEX IF NOT EXISTS idx_appointment_doctor
+    ON Appointment(doctor_id);
+
+CREATE INDEX IF NOT EXISTS idx_appointment_patient
+    ON Appointment(patient_ssn, patient_name);
+
+CREATE INDEX IF NOT EXISTS idx_prescription_prescriber
+    ON Prescription(prescriber_id);
+
+CREATE INDEX IF NOT EXISTS idx_prescription_patient
+    ON Prescription(prescripted_patient_ssn, prescripted_patient_name);
+
+CREATE INDEX IF NOT EXISTS idx_prescription_policy
+    ON Prescription(policy_id);
+
+CREATE INDEX IF NOT EXISTS idx_doctor_department
+    ON Doctor(department_name);
+
+CREATE INDEX IF NOT EXISTS idx_contains_medication
+    ON Contains(medication_name);
+
+CREATE INDEX IF NOT EXISTS idx_manages_medication
+    ON Manages(medication_name);
+
+CREATE INDEX IF NOT EXISTS idx_medication_dispensed_dispenser
+    ON Medication_dispensed(dispenser_id);
+
+-- city/street first so view_pharmacy_details can seek on it, all four columns
+-- so the Pharmacy foreign key check is covered too
+CREATE INDEX IF NOT EXISTS idx_pharmacist_pharmacy
+    ON Pharmacist(pharmacy_city, pharmacy_street, pharmacy_state, pharmacy_zip_code);
+
+CREATE INDEX IF NOT EXISTS idx_patient_primary_care
+    ON Patient(primary_care_assigned_id);
+
+CREATE INDEX IF NOT EXISTS idx_patient_insurance_policy
+    ON Patient_Healthcare_Insurance(policy_id);
+
+CREATE INDEX IF NOT EXISTS idx_user_account_patient
+    ON User_Account(patient_ssn, patient_name);
+
+CREATE INDEX IF NOT EXISTS idx_user_account_doctor
+    ON User_Account(doctor_id);
+
+CREATE INDEX IF NOT EXISTS idx_user_account_pharmacist
+    ON User_Account(pharmacist_id);
@@ -0,0 +1,17 @@
+--SJSU CMPE 138 FALL 2025 TEAM6 
+-- Queue of prescriptions that have not been dispensed yet. A row is added by
+-- create_prescription and removed by dispense_prescription in the same
+-- transaction as the Prescription / Medication_dispensed write, so listing
+-- pending work is a rowid range scan instead of an anti-join over history.
+
+CREATE TABLE Pending_prescription(
+    prescription_id INTEGER PRIMARY KEY,
+
+    FOREIGN KEY (prescription_id)
+        REFERENCES Prescription(prescription_id)
+);
+
+INSERT INTO Pending_prescription (prescription_id)
+SELECT prescription_id
+FROM Prescription
+WHERE prescription_id NOT IN (SELECT prescription_id FROM Medication_dispensed);
@@ -0,0 +1,171 @@
+--SJSU CMPE 138 FALL 2025 TEAM6 
+-- Running counters for the admin statistics screen, kept current by
+-- triggers so the screen never has to COUNT(*) a whole table.
+
+CREATE TABLE Entity_count(
+    entity TEXT PRIMARY KEY,
+    n      INTEGER NOT NULL DEFAULT 0
+);
+
+INSERT INTO Entity_count (entity, n)
+SELECT 'Patient', COUNT(*) FROM Patient
+UNION ALL SELECT 'Doctor', COUNT(*) FROM Doctor
+UNION ALL SELECT 'Appointment', COUNT(*) FROM Appointment
+UNION ALL SELECT 'Prescription', COUNT(*) FROM Prescription
+UNION ALL SELECT 'Department', COUNT(*) FROM Department
+UNION ALL SELECT 'Pharmacy', COUNT(*) FROM Pharmacy
+UNION ALL SELECT 'Pharmacist', COUNT(*) FROM Pharmacist
+UNION ALL SELECT 'Medication', COUNT(*) FROM Medication
+UNION ALL SELECT 'User_Account', COUNT(*) FROM User_Account;
+
+CREATE TRIGGER trg_count_patient_insert AFTER INSERT ON Patient
+BEGIN
+    UPDATE Entity_count SET n = n + 1 WHERE entity = 'Patient';
+END;
+
+CREATE TRIGGER trg_count_patient_delete AFTER DELETE ON Patient
+BEGIN
+    UPDATE Entity_count SET n = n - 1 WHERE entity = 'Patient';
+END;
+
+CREATE TRIGGER trg_count_doctor_insert AFTER INSERT ON Doctor
+BEGIN
+    UPDATE Entity_count SET n = n + 1 WHERE entity = 'Doctor';
+END;
+
+CREATE TRIGGER trg_count_doctor_delete AFTER DELETE ON Doctor
+BEGIN
+    UPDATE Entity_count SET n = n - 1 WHERE entity = 'Doctor';
+END;
+
+CREATE TRIGGER trg_count_appointment_insert AFTER INSERT ON Appointment
+BEGIN
+    UPDATE Entity_count SET n = n + 1 WHERE entity = 'Appointment';
+END;
+
+CREATE TRIGGER trg_count_appointment_delete AFTER DELETE ON Appointment
+BEGIN
+    UPDATE Entity_count SET n = n - 1 WHERE entity = 'Appointment';
+END;
+
+CREATE TRIGGER trg_count_prescription_insert AFTER INSERT ON Prescription
+BEGIN
+    UPDATE Entity_count SET n = n + 1 WHERE entity = 'Prescription';
+END;
+
+CREATE TRIGGER trg_count_prescription_delete AFTER DELETE ON Prescription
+BEGIN
+    UPDATE Entity_count SET n = n - 1 WHERE entity = 'Prescription';
+END;
+
+CREATE TRIGGER trg_count_department_insert AFTER INSERT ON Department
+BEGIN
+    UPDATE Entity_count SET n = n + 1 WHERE entity = 'Department';
+END;
+
+CREATE TRIGGER trg_count_department_delete AFTER DELETE ON Department
+BEGIN
+    UPDATE Entity_count SET n = n - 1 WHERE entity = 'Department';
+END;
+
+CREATE TRIGGER trg_count_pharmacy_insert AFTER INSERT ON Pharmacy
+BEGIN
+    UPDATE Entity_count SET n = n + 1 WHERE entity = 'Pharmacy';
+END;
+
+CREATE TRIGGER trg_count_pharmacy_delete AFTER DELETE ON Pharmacy
+BEGIN
+    UPDATE Entity_count SET n = n - 1 WHERE entity = 'Pharmacy';
+END;
+
+CREATE TRIGGER trg_count_pharmacist_insert AFTER INSERT ON Pharmacist
+BEGIN
+    UPDATE Entity_count SET n = n + 1 WHERE entity = 'Pharmacist';
+END;
+
+CREATE TRIGGER trg_count_pharmacist_delete AFTER DELETE ON Pharmacist
+BEGIN
+    UPDATE Entity_count SET n = n - 1 WHERE entity = 'Pharmacist';
+END;
+
+CREATE TRIGGER trg_count_medication_insert AFTER INSERT ON Medication
+BEGIN
+    UPDATE Entity_count SET n = n + 1 WHERE entity = 'Medication';
+END;
+
+CREATE TRIGGER trg_count_medication_delete AFTER DELETE ON Medication
+BEGIN
+    UPDATE Entity_count SET n = n - 1 WHERE entity = 'Medication';
+END;
+
+CREATE TRIGGER trg_count_user_account_insert AFTER INSERT ON User_Account
+BEGIN
+    UPDATE Entity_count SET n = n + 1 WHERE entity = 'User_Account';
+END;
+
+CREATE TRIGGER trg_count_user_account_delete AFTER DELETE ON User_Account
+BEGIN
+    UPDATE Entity_count SET n = n - 1 WHERE entity = 'User_Account';
+END;
+
+-- Per-doctor workload, used for the per-doctor and per-department
+-- breakdowns (a department total is a sum over its doctors' rows).
+CREATE TABLE Doctor_activity(
+    doctor_id     INTEGER PRIMARY KEY,
+    appointments  INTEGER NOT NULL DEFAULT 0,
+    prescriptions INTEGER NOT NULL DEFAULT 0,
+
+    FOREIGN KEY (doctor_id)
+        REFERENCES Doctor(id)
+);
+
+INSERT INTO Doctor_activity (doctor_id, appointments, prescriptions)
+SELECT D.id,
+       (SELECT COUNT(*) FROM Appointment A WHERE A.doctor_id = D.id),
+       (SELECT COUNT(*) FROM Prescription Pr WHERE Pr.prescriber_id = D.id)
+FROM Doctor D;
+
+CREATE TRIGGER trg_activity_doctor_insert AFTER INSERT ON Doctor
+BEGIN
+    INSERT INTO Doctor_activity (doctor_id) VALUES (NEW.id);
+END;
+
+CREATE TRIGGER trg_activity_doctor_delete AFTER DELETE ON Doctor
+BEGIN
+    DELETE FROM Doctor_activity WHERE doctor_id = OLD.id;
+END;
+
+CREATE TRIGGER trg_activity_appointment_insert AFTER INSERT ON Appointment
+BEGIN
+    UPDATE Doctor_activity SET appointments = appointments + 1 WHERE doctor_id = NEW.doctor_id;
+END;
+
+CREATE TRIGGER trg_activity_appointment_delete AFTER DELETE ON Appointment
+BEGIN
+    UPDATE Doctor_activity SET appointments = appointments - 1 WHERE doctor_id = OLD.doctor_id;
+END;
+
+CREATE TRIGGER trg_activity_appointment_update AFTER UPDATE OF doctor_id ON Appointment
+BEGIN
+    UPDATE Doctor_activity SET appointments = appointments - 1 WHERE doctor_id = OLD.doctor_id;
+    UPDATE Doctor_activity SET appointments = appointments + 1 WHERE doctor_id = NEW.doctor_id;
+END;
+
+CREATE TRIGGER trg_activity_prescription_insert AFTER INSERT ON Prescription
+BEGIN
+    UPDATE Doctor_activity SET prescriptions = prescriptions + 1 WHERE doctor_id = NEW.prescriber_id;
+END;
+
+CREATE TRIGGER trg_activity_prescription_delete AFTER DELETE ON Prescription
+BEGIN
+    UPDATE Doctor_activity SET prescriptions = prescriptions - 1 WHERE doctor_id = OLD.prescriber_id;
+END;
+
+CREATE TRIGGER trg_activity_prescription_update AFTER UPDATE OF prescriber_id ON Prescription
+BEGIN
+    UPDATE Doctor_activity SET prescriptions = prescriptions - 1 WHERE doctor_id = OLD.prescriber_id;
+    UPDATE Doctor_activity SET prescriptions = prescriptions + 1 WHERE doctor_id = NEW.prescriber_id;
+END;
+
+-- low-stock lookups become an index range scan
+CREATE INDEX idx_medication_stock ON Medication(quantity_in_stock);
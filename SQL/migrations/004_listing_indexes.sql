@@ -0,0 +1,15 @@
+--SJSU CMPE 138 FALL 2025 TEAM6 
+-- Indexes matching the ORDER BY keys of the paged list screens, so a page
+-- is a seek plus LIMIT instead of a sort of the whole table.
+
+CREATE INDEX IF NOT EXISTS idx_patient_name
+    ON Patient(name, ssn);
+
+CREATE INDEX IF NOT EXISTS idx_doctor_name
+    ON Doctor(name);
+
+CREATE INDEX IF NOT EXISTS idx_appointment_datetime
+    ON Appointment(scheduled_datetime);
+
+CREATE INDEX IF NOT EXISTS idx_pharmacy_city
+    ON Pharmacy(city, street, state, zip_code);
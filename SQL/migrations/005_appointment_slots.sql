@@ -0,0 +1,49 @@
+--SJSU CMPE 138 FALL 2025 TEAM6 
+-- Conflict-free booking. Every appointment takes one 15 minute slot
+-- (schedule.SLOT_MINUTES); Appointment_slot has one row per booked
+-- (doctor, slot) and that pair is its primary key, so a second booking of
+-- the same slot fails the INSERT INTO Appointment itself with a UNIQUE
+-- error, found by one index probe inside the same transaction.
+--
+--   slot = unixepoch(scheduled_datetime) / 900
+--
+-- A scheduled_datetime SQLite cannot read gives a NULL slot, which the
+-- NOT NULL constraint rejects, so new rows must carry a real date/time.
+
+ALTER TABLE Appointment ADD COLUMN end_datetime TEXT;
+
+UPDATE Appointment SET
+    scheduled_datetime = COALESCE(datetime(scheduled_datetime), scheduled_datetime),
+    end_datetime = datetime(scheduled_datetime, '+15 minutes');
+
+CREATE TABLE Appointment_slot(
+    doctor_id      INTEGER NOT NULL,
+    slot           INTEGER NOT NULL,
+    appointment_id INTEGER NOT NULL UNIQUE,
+    PRIMARY KEY (doctor_id, slot)
+) WITHOUT ROWID;
+
+-- existing double bookings: the earliest appointment keeps the slot
+INSERT OR IGNORE INTO Appointment_slot (doctor_id, slot, appointment_id)
+SELECT doctor_id, unixepoch(scheduled_datetime) / 900, appointment_id
+FROM Appointment
+WHERE unixepoch(scheduled_datetime) IS NOT NULL
+ORDER BY appointment_id;
+
+CREATE TRIGGER trg_slot_appointment_insert AFTER INSERT ON Appointment
+BEGIN
+    INSERT INTO Appointment_slot (doctor_id, slot, appointment_id)
+    VALUES (NEW.doctor_id, unixepoch(NEW.scheduled_datetime) / 900, NEW.appointment_id);
+END;
+
+CREATE TRIGGER trg_slot_appointment_delete AFTER DELETE ON Appointment
+BEGIN
+    DELETE FROM Appointment_slot WHERE appointment_id = OLD.appointment_id;
+END;
+
+CREATE TRIGGER trg_slot_appointment_update AFTER UPDATE OF doctor_id, scheduled_datetime ON Appointment
+BEGIN
+    DELETE FROM Appointment_slot WHERE appointment_id = OLD.appointment_id;
+    INSERT INTO Appointment_slot (doctor_id, slot, appointment_id)
+    VALUES (NEW.doctor_id, unixepoch(NEW.scheduled_datetime) / 900, NEW.appointment_id);
+END;
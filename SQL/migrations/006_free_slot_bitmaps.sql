@@ -0,0 +1,42 @@
+--SJSU CMPE 138 FALL 2025 TEAM6 
+-- Per-doctor, per-day booked-slot bitmaps for availability searches.
+-- Bit i of Doctor_day.busy is the i-th slot of the opening hours
+-- (08:00 + 15 min * i, 36 bits for 08:00 - 17:00). Triggers on
+-- Appointment_slot (migration 005) set and clear single bits, so a search
+-- reads one small integer per doctor and day instead of the appointments.
+--
+--   day = date(slot * 900, 'unixepoch'),  i = slot % 96 - 32
+--
+-- must match schedule.SLOT_MINUTES / OPEN_HOUR / CLOSE_HOUR. Slots outside
+-- the opening hours (old data) are not represented.
+
+CREATE TABLE Doctor_day(
+    doctor_id INTEGER NOT NULL,
+    day       TEXT NOT NULL,
+    busy      INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (doctor_id, day)
+) WITHOUT ROWID;
+
+-- Appointment_slot holds each (doctor, slot) once, so SUM works as a bitwise OR
+INSERT INTO Doctor_day (doctor_id, day, busy)
+SELECT doctor_id, date(slot * 900, 'unixepoch'), SUM(1 << (slot % 96 - 32))
+FROM Appointment_slot
+WHERE slot % 96 BETWEEN 32 AND 67
+GROUP BY doctor_id, slot / 96;
+
+CREATE TRIGGER trg_day_slot_insert AFTER INSERT ON Appointment_slot
+WHEN NEW.slot % 96 BETWEEN 32 AND 67
+BEGIN
+    INSERT INTO Doctor_day (doctor_id, day, busy)
+    VALUES (NEW.doctor_id, date(NEW.slot * 900, 'unixepoch'), 1 << (NEW.slot % 96 - 32))
+    ON CONFLICT (doctor_id, day) DO UPDATE SET busy = busy | excluded.busy;
+END;
+
+CREATE TRIGGER trg_day_slot_delete AFTER DELETE ON Appointment_slot
+WHEN OLD.slot % 96 BETWEEN 32 AND 67
+BEGIN
+    UPDATE Doctor_day SET busy = busy & ~(1 << (OLD.slot % 96 - 32))
+    WHERE doctor_id = OLD.doctor_id AND day = date(OLD.slot * 900, 'unixepoch');
+    DELETE FROM Doctor_day
+    WHERE doctor_id = OLD.doctor_id AND day = date(OLD.slot * 900, 'unixepoch') AND busy = 0;
+END;
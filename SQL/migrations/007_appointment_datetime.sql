@@ -0,0 +1,100 @@
+--SJSU CMPE 138 FALL 2025 TEAM6 
+-- Canonical appointment times. scheduled_datetime and end_datetime must be
+-- exactly "YYYY-MM-DD HH:MM:SS", so text order is time order and a date range
+-- is an index range scan. SQLite cannot add a CHECK to an existing table,
+-- so Appointment is rebuilt; the triggers from 003 and 005 go with the old
+-- table and are created again below.
+--
+-- Any time datetime() cannot read fails the NOT NULL below and the whole
+-- migration rolls back; fix those rows by hand and run it again.
+
+CREATE TABLE Appointment_new
+(
+    appointment_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    patient_ssn TEXT NOT NULL,
+    patient_name TEXT NOT NULL,
+    doctor_id INTEGER NOT NULL,
+    scheduled_datetime TEXT NOT NULL
+        CHECK (scheduled_datetime = strftime('%Y-%m-%d %H:%M:%S', scheduled_datetime)),
+    end_datetime TEXT NOT NULL
+        CHECK (end_datetime = strftime('%Y-%m-%d %H:%M:%S', end_datetime)
+               AND end_datetime > scheduled_datetime),
+
+    FOREIGN KEY (patient_ssn,patient_name)
+        REFERENCES Patient(ssn,name),
+    FOREIGN KEY (doctor_id)
+        REFERENCES Doctor(id)
+);
+
+INSERT INTO Appointment_new
+    (appointment_id, patient_ssn, patient_name, doctor_id, scheduled_datetime, end_datetime)
+SELECT appointment_id, patient_ssn, patient_name, doctor_id,
+       datetime(scheduled_datetime),
+       COALESCE(datetime(end_datetime), datetime(scheduled_datetime, '+15 minutes'))
+FROM Appointment;
+
+DROP TABLE Appointment;
+ALTER TABLE Appointment_new RENAME TO Appointment;
+
+-- (doctor, time) and (patient, time) serve both the equality filter and the
+-- ORDER BY / range of every per-doctor and per-patient appointment screen
+CREATE INDEX idx_appointment_doctor_time
+    ON Appointment(doctor_id, scheduled_datetime);
+
+CREATE INDEX idx_appointment_patient_time
+    ON Appointment(patient_ssn, patient_name, scheduled_datetime);
+
+CREATE INDEX idx_appointment_datetime
+    ON Appointment(scheduled_datetime);
+
+-- from 003
+CREATE TRIGGER trg_count_appointment_insert AFTER INSERT ON Appointment
+BEGIN
+    UPDATE Entity_count SET n = n + 1 WHERE entity = 'Appointment';
+END;
+
+CREATE TRIGGER trg_count_appointment_delete AFTER DELETE ON Appointment
+BEGIN
+    UPDATE Entity_count SET n = n - 1 WHERE entity = 'Appointment';
+END;
+
+CREATE TRIGGER trg_activity_appointment_insert AFTER INSERT ON Appointment
+BEGIN
+    UPDATE Doctor_activity SET appointments = appointments + 1 WHERE doctor_id = NEW.doctor_id;
+END;
+
+CREATE TRIGGER trg_activity_appointment_delete AFTER DELETE ON Appointment
+BEGIN
+    UPDATE Doctor_activity SET appointments = appointments - 1 WHERE doctor_id = OLD.doctor_id;
+END;
+
+CREATE TRIGGER trg_activity_appointment_update AFTER UPDATE OF doctor_id ON Appointment
+BEGIN
+    UPDATE Doctor_activity SET appointments = appointments - 1 WHERE doctor_id = OLD.doctor_id;
+    UPDATE Doctor_activity SET appointments = appointments + 1 WHERE doctor_id = NEW.doctor_id;
+END;
+
+-- from 005
+CREATE TRIGGER trg_slot_appointment_insert AFTER INSERT ON Appointment
+BEGIN
+    INSERT INTO Appointment_slot (doctor_id, slot, appointment_id)
+    VALUES (NEW.doctor_id, unixepoch(NEW.scheduled_datetime) / 900, NEW.appointment_id);
+END;
+
+CREATE TRIGGER trg_slot_appointment_delete AFTER DELETE ON Appointment
+BEGIN
+    DELETE FROM Appointment_slot WHERE appointment_id = OLD.appointment_id;
+END;
+
+CREATE TRIGGER trg_slot_appointment_update AFTER UPDATE OF doctor_id, scheduled_datetime ON Appointment
+BEGIN
+    DELETE FROM Appointment_slot WHERE appointment_id = OLD.appointment_id;
+    INSERT INTO Appointment_slot (doctor_id, slot, appointment_id)
+    VALUES (NEW.doctor_id, unixepoch(NEW.scheduled_datetime) / 900, NEW.appointment_id);
+END;
+
+-- Appointments from now on. Times are stored as local time.
+CREATE VIEW Upcoming_appointment AS
+SELECT appointment_id, patient_ssn, patient_name, doctor_id, scheduled_datetime, end_datetime
+FROM Appointment
+WHERE scheduled_datetime >= datetime('now', 'localtime');
@@ -0,0 +1,307 @@
+--SJSU CMPE 138 FALL 2025 TEAM6
+-- Integer patient key. Patient was keyed on (ssn, name) and that TEXT pair
+-- was copied into Appointment, Prescription, Patient_Healthcare_Insurance
+-- and User_Account, so every join compared two strings, every child index
+-- stored both and correcting a name meant updating every child row.
+--
+-- Patient gets patient_id INTEGER PRIMARY KEY (its old rowid, so ids follow
+-- insertion order) and ssn becomes UNIQUE on its own; the child tables carry
+-- patient_id only. Each table is rebuilt, so the triggers from 003, 005 and
+-- 007 are created again. The *_compat views show the old columns for
+-- anything that still reads them.
+--
+-- A child row whose (ssn, name) matches no patient fails a NOT NULL below,
+-- and a patient account with no match fails User_Account's CHECK, before
+-- any table is swapped; the migration then rolls back, as it does for a
+-- SSN shared by two patients.
+
+DROP VIEW Upcoming_appointment;
+
+--   NEW TABLES
+CREATE TABLE Patient_new(
+    patient_id INTEGER PRIMARY KEY,
+    ssn TEXT NOT NULL UNIQUE,
+    name TEXT NOT NULL,
+    age INTEGER,
+    weight REAL,
+    phone_number TEXT,
+    dob_day INTEGER CHECK (dob_day >= 1 AND dob_day <= 31),
+    dob_month INTEGER CHECK (dob_month >= 1 AND dob_month <= 12),
+    dob_year INTEGER,
+    street TEXT,
+    city TEXT,
+    state TEXT,
+    zip_code TEXT,
+    primary_care_assigned_id INTEGER,
+
+    FOREIGN KEY (primary_care_assigned_id)
+        REFERENCES Primary_Care(primary_care_id)
+);
+
+CREATE TABLE Appointment_new
+(
+    appointment_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    patient_id INTEGER NOT NULL,
+    doctor_id INTEGER NOT NULL,
+    scheduled_datetime TEXT NOT NULL
+        CHECK (scheduled_datetime = strftime('%Y-%m-%d %H:%M:%S', scheduled_datetime)),
+    end_datetime TEXT NOT NULL
+        CHECK (end_datetime = strftime('%Y-%m-%d %H:%M:%S', end_datetime)
+               AND end_datetime > scheduled_datetime),
+
+    FOREIGN KEY (patient_id)
+        REFERENCES Patient(patient_id),
+    FOREIGN KEY (doctor_id)
+        REFERENCES Doctor(id)
+);
+
+CREATE TABLE Patient_Healthcare_Insurance_new(
+    patient_id INTEGER NOT NULL,
+    policy_id INTEGER NOT NULL,
+    PRIMARY KEY (patient_id, policy_id),
+    FOREIGN KEY (patient_id)
+        REFERENCES Patient(patient_id),
+    FOREIGN KEY (policy_id)
+        REFERENCES Healthcare_Insurance(policy_id)
+) WITHOUT ROWID;
+
+CREATE TABLE Prescription_new (
+    prescription_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    prescriber_id INTEGER NOT NULL,
+    policy_id INTEGER,
+    patient_id INTEGER NOT NULL,
+
+    dosage TEXT NOT NULL,
+
+    FOREIGN KEY (prescriber_id)
+        REFERENCES Doctor(id),
+    FOREIGN KEY (policy_id)
+        REFERENCES Healthcare_Insurance(policy_id),
+    FOREIGN KEY (patient_id)
+        REFERENCES Patient(patient_id)
+);
+
+CREATE TABLE User_Account_new (
+    user_id        INTEGER PRIMARY KEY AUTOINCREMENT,
+    username       TEXT NOT NULL UNIQUE,
+    password_hash  TEXT NOT NULL,
+    role           TEXT NOT NULL CHECK (role IN ('patient','doctor','pharmacist','admin')),
+
+    patient_id     INTEGER,
+    doctor_id      INTEGER,
+    pharmacist_id  INTEGER,
+
+    -- a patient account must point at a patient; this is also what stops the
+    -- copy below when an account's (ssn, name) matches no patient
+    CHECK (role <> 'patient' OR patient_id IS NOT NULL),
+
+    FOREIGN KEY (patient_id)
+        REFERENCES Patient(patient_id),
+    FOREIGN KEY (doctor_id)
+        REFERENCES Doctor(id),
+    FOREIGN KEY (pharmacist_id)
+        REFERENCES Pharmacist(id)
+);
+
+--   COPY
+INSERT INTO Patient_new
+    (patient_id, ssn, name, age, weight, phone_number, dob_day, dob_month, dob_year,
+     street, city, state, zip_code, primary_care_assigned_id)
+SELECT rowid, ssn, name, age, weight, phone_number, dob_day, dob_month, dob_year,
+       street, city, state, zip_code, primary_care_assigned_id
+FROM Patient;
+
+INSERT INTO Appointment_new
+    (appointment_id, patient_id, doctor_id, scheduled_datetime, end_datetime)
+SELECT A.appointment_id, P.patient_id, A.doctor_id, A.scheduled_datetime, A.end_datetime
+FROM Appointment A
+LEFT JOIN Patient_new P ON P.ssn = A.patient_ssn AND P.name = A.patient_name;
+
+INSERT INTO Patient_Healthcare_Insurance_new (patient_id, policy_id)
+SELECT P.patient_id, I.policy_id
+FROM Patient_Healthcare_Insurance I
+LEFT JOIN Patient_new P ON P.ssn = I.patient_ssn AND P.name = I.patient_name;
+
+INSERT INTO Prescription_new (prescription_id, prescriber_id, policy_id, patient_id, dosage)
+SELECT Pr.prescription_id, Pr.prescriber_id, Pr.policy_id, P.patient_id, Pr.dosage
+FROM Prescription Pr
+LEFT JOIN Patient_new P
+    ON P.ssn = Pr.prescripted_patient_ssn AND P.name = Pr.prescripted_patient_name;
+
+INSERT INTO User_Account_new
+    (user_id, username, password_hash, role, patient_id, doctor_id, pharmacist_id)
+SELECT U.user_id, U.username, U.password_hash, U.role, P.patient_id, U.doctor_id, U.pharmacist_id
+FROM User_Account U
+LEFT JOIN Patient_new P ON P.ssn = U.patient_ssn AND P.name = U.patient_name;
+
+--   SWAP
+DROP TABLE Appointment;
+DROP TABLE Patient_Healthcare_Insurance;
+DROP TABLE Prescription;
+DROP TABLE User_Account;
+DROP TABLE Patient;
+
+ALTER TABLE Patient_new RENAME TO Patient;
+ALTER TABLE Appointment_new RENAME TO Appointment;
+ALTER TABLE Patient_Healthcare_Insurance_new RENAME TO Patient_Healthcare_Insurance;
+ALTER TABLE Prescription_new RENAME TO Prescription;
+ALTER TABLE User_Account_new RENAME TO User_Account;
+
+--   INDEXES
+-- name only: the integer rowid rides along in every index entry
+CREATE INDEX idx_patient_name
+    ON Patient(name);
+
+CREATE INDEX idx_patient_primary_care
+    ON Patient(primary_care_assigned_id);
+
+CREATE INDEX idx_appointment_doctor_time
+    ON Appointment(doctor_id, scheduled_datetime);
+
+CREATE INDEX idx_appointment_patient_time
+    ON Appointment(patient_id, scheduled_datetime);
+
+CREATE INDEX idx_appointment_datetime
+    ON Appointment(scheduled_datetime);
+
+CREATE INDEX idx_patient_insurance_policy
+    ON Patient_Healthcare_Insurance(policy_id);
+
+CREATE INDEX idx_prescription_prescriber
+    ON Prescription(prescriber_id);
+
+CREATE INDEX idx_prescription_patient
+    ON Prescription(patient_id);
+
+CREATE INDEX idx_prescription_policy
+    ON Prescription(policy_id);
+
+CREATE INDEX idx_user_account_patient
+    ON User_Account(patient_id);
+
+CREATE INDEX idx_user_account_doctor
+    ON User_Account(doctor_id);
+
+CREATE INDEX idx_user_account_pharmacist
+    ON User_Account(pharmacist_id);
+
+--   TRIGGERS (from 003, 005 and 007)
+CREATE TRIGGER trg_count_patient_insert AFTER INSERT ON Patient
+BEGIN
+    UPDATE Entity_count SET n = n + 1 WHERE entity = 'Patient';
+END;
+
+CREATE TRIGGER trg_count_patient_delete AFTER DELETE ON Patient
+BEGIN
+    UPDATE Entity_count SET n = n - 1 WHERE entity = 'Patient';
+END;
+
+CREATE TRIGGER trg_count_appointment_insert AFTER INSERT ON Appointment
+BEGIN
+    UPDATE Entity_count SET n = n + 1 WHERE entity = 'Appointment';
+END;
+
+CREATE TRIGGER trg_count_appointment_delete AFTER DELETE ON Appointment
+BEGIN
+    UPDATE Entity_count SET n = n - 1 WHERE entity = 'Appointment';
+END;
+
+CREATE TRIGGER trg_activity_appointment_insert AFTER INSERT ON Appointment
+BEGIN
+    UPDATE Doctor_activity SET appointments = appointments + 1 WHERE doctor_id = NEW.doctor_id;
+END;
+
+CREATE TRIGGER trg_activity_appointment_delete AFTER DELETE ON Appointment
+BEGIN
+    UPDATE Doctor_activity SET appointments = appointments - 1 WHERE doctor_id = OLD.doctor_id;
+END;
+
+CREATE TRIGGER trg_activity_appointment_update AFTER UPDATE OF doctor_id ON Appointment
+BEGIN
+    UPDATE Doctor_activity SET appointments = appointments - 1 WHERE doctor_id = OLD.doctor_id;
+    UPDATE Doctor_activity SET appointments = appointments + 1 WHERE doctor_id = NEW.doctor_id;
+END;
+
+CREATE TRIGGER trg_slot_appointment_insert AFTER INSERT ON Appointment
+BEGIN
+    INSERT INTO Appointment_slot (doctor_id, slot, appointment_id)
+    VALUES (NEW.doctor_id, unixepoch(NEW.scheduled_datetime) / 900, NEW.appointment_id);
+END;
+
+CREATE TRIGGER trg_slot_appointment_delete AFTER DELETE ON Appointment
+BEGIN
+    DELETE FROM Appointment_slot WHERE appointment_id = OLD.appointment_id;
+END;
+
+CREATE TRIGGER trg_slot_appointment_update AFTER UPDATE OF doctor_id, scheduled_datetime ON Appointment
+BEGIN
+    DELETE FROM Appointment_slot WHERE appointment_id = OLD.appointment_id;
+    INSERT INTO Appointment_slot (doctor_id, slot, appointment_id)
+    VALUES (NEW.doctor_id, unixepoch(NEW.scheduled_datetime) / 900, NEW.appointment_id);
+END;
+
+CREATE TRIGGER trg_count_prescription_insert AFTER INSERT ON Prescription
+BEGIN
+    UPDATE Entity_count SET n = n + 1 WHERE entity = 'Prescription';
+END;
+
+CREATE TRIGGER trg_count_prescription_delete AFTER DELETE ON Prescription
+BEGIN
+    UPDATE Entity_count SET n = n - 1 WHERE entity = 'Prescription';
+END;
+
+CREATE TRIGGER trg_activity_prescription_insert AFTER INSERT ON Prescription
+BEGIN
+    UPDATE Doctor_activity SET prescriptions = prescriptions + 1 WHERE doctor_id = NEW.prescriber_id;
+END;
+
+CREATE TRIGGER trg_activity_prescription_delete AFTER DELETE ON Prescription
+BEGIN
+    UPDATE Doctor_activity SET prescriptions = prescriptions - 1 WHERE doctor_id = OLD.prescriber_id;
+END;
+
+CREATE TRIGGER trg_activity_prescription_update AFTER UPDATE OF prescriber_id ON Prescription
+BEGIN
+    UPDATE Doctor_activity SET prescriptions = prescriptions - 1 WHERE doctor_id = OLD.prescriber_id;
+    UPDATE Doctor_activity SET prescriptions = prescriptions + 1 WHERE doctor_id = NEW.prescriber_id;
+END;
+
+CREATE TRIGGER trg_count_user_account_insert AFTER INSERT ON User_Account
+BEGIN
+    UPDATE Entity_count SET n = n + 1 WHERE entity = 'User_Account';
+END;
+
+CREATE TRIGGER trg_count_user_account_delete AFTER DELETE ON User_Account
+BEGIN
+    UPDATE Entity_count SET n = n - 1 WHERE entity = 'User_Account';
+END;
+
+--   VIEWS
+CREATE VIEW Upcoming_appointment AS
+SELECT appointment_id, patient_id, doctor_id, scheduled_datetime, end_datetime
+FROM Appointment
+WHERE scheduled_datetime >= datetime('now', 'localtime');
+
+-- the old column layout, read-only
+CREATE VIEW Appointment_compat AS
+SELECT A.appointment_id, P.ssn AS patient_ssn, P.name AS patient_name,
+       A.doctor_id, A.scheduled_datetime, A.end_datetime
+FROM Appointment A
+JOIN Patient P ON P.patient_id = A.patient_id;
+
+CREATE VIEW Patient_Healthcare_Insurance_compat AS
+SELECT P.ssn AS patient_ssn, P.name AS patient_name, I.policy_id
+FROM Patient_Healthcare_Insurance I
+JOIN Patient P ON P.patient_id = I.patient_id;
+
+CREATE VIEW Prescription_compat AS
+SELECT Pr.prescription_id, Pr.prescriber_id, Pr.policy_id,
+       P.ssn AS prescripted_patient_ssn, P.name AS prescripted_patient_name, Pr.dosage
+FROM Prescription Pr
+JOIN Patient P ON P.patient_id = Pr.patient_id;
+
+CREATE VIEW User_Account_compat AS
+SELECT U.user_id, U.username, U.password_hash, U.role,
+       P.ssn AS patient_ssn, P.name AS patient_name, U.doctor_id, U.pharmacist_id
+FROM User_Account U
+LEFT JOIN Patient P ON P.patient_id = U.patient_id;
@@ -0,0 +1,71 @@
+--SJSU CMPE 138 FALL 2025 TEAM6
+-- Stock movement ledger and daily consumption for reorder forecasting.
+--
+-- Medication only holds the current quantity_in_stock; dispensing and stock
+-- updates overwrite it. Stock_movement keeps every change as an append-only
+-- row: an 'initial' row when a medication is added (and one per existing
+-- medication below), a -1 'dispense' row per medication of a dispensed
+-- prescription, and an 'adjust' row for the difference when a pharmacist
+-- sets a new stock level. The services write the dispense and adjust rows in
+-- the same transaction as the Medication update.
+--
+-- Medication_daily_use is the per-medication, per-day total of dispensed
+-- units, kept current by a trigger on Stock_movement. The reorder report
+-- reads a few weeks of it per medication instead of the ledger.
+
+CREATE TABLE Stock_movement(
+    movement_id INTEGER PRIMARY KEY,
+    medication_name TEXT NOT NULL,
+    moved_at TEXT NOT NULL DEFAULT (datetime('now', 'localtime')),
+    change INTEGER NOT NULL CHECK (change <> 0),
+    reason TEXT NOT NULL CHECK (reason IN ('initial', 'dispense', 'adjust')),
+    prescription_id INTEGER,  -- set for 'dispense'
+
+    FOREIGN KEY (medication_name)
+        REFERENCES Medication(name),
+    FOREIGN KEY (prescription_id)
+        REFERENCES Prescription(prescription_id)
+);
+
+-- one medication's history in movement_id order
+CREATE INDEX idx_stock_movement_medication
+    ON Stock_movement(medication_name);
+
+CREATE INDEX idx_stock_movement_prescription
+    ON Stock_movement(prescription_id);
+
+CREATE TABLE Medication_daily_use(
+    medication_name TEXT NOT NULL,
+    day TEXT NOT NULL,                -- YYYY-MM-DD
+    dispensed INTEGER NOT NULL,
+    PRIMARY KEY (medication_name, day)
+) WITHOUT ROWID;
+
+INSERT INTO Stock_movement (medication_name, change, reason)
+SELECT name, quantity_in_stock, 'initial' FROM Medication
+WHERE quantity_in_stock <> 0;
+
+CREATE TRIGGER trg_stock_movement_no_update BEFORE UPDATE ON Stock_movement
+BEGIN
+    SELECT RAISE(ABORT, 'Stock_movement is append-only');
+END;
+
+CREATE TRIGGER trg_stock_movement_no_delete BEFORE DELETE ON Stock_movement
+BEGIN
+    SELECT RAISE(ABORT, 'Stock_movement is append-only');
+END;
+
+CREATE TRIGGER trg_stock_medication_insert AFTER INSERT ON Medication
+WHEN NEW.quantity_in_stock <> 0
+BEGIN
+    INSERT INTO Stock_movement (medication_name, change, reason)
+    VALUES (NEW.name, NEW.quantity_in_stock, 'initial');
+END;
+
+CREATE TRIGGER trg_daily_use_dispense AFTER INSERT ON Stock_movement
+WHEN NEW.reason = 'dispense'
+BEGIN
+    INSERT INTO Medication_daily_use (medication_name, day, dispensed)
+    VALUES (NEW.medication_name, date(NEW.moved_at), -NEW.change)
+    ON CONFLICT (medication_name, day) DO UPDATE SET dispensed = dispensed + excluded.dispensed;
+END;
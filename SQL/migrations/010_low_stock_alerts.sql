@@ -0,0 +1,53 @@
+--SJSU CMPE 138 FALL 2025 TEAM6
+-- Per-medication reorder thresholds and a trigger-maintained low-stock list.
+--
+-- Low stock used to mean quantity_in_stock < 10, checked against every
+-- Medication row. Each medication now has its own reorder_threshold (10 for
+-- the existing ones) and Low_stock holds exactly the medications below it.
+-- The triggers only touch Low_stock when a stock or threshold change crosses
+-- the threshold, so the many dispenses above or below it cost nothing extra,
+-- and listing alerts reads Low_stock plus one Medication lookup per alert.
+
+ALTER TABLE Medication ADD COLUMN reorder_threshold INTEGER NOT NULL DEFAULT 10
+    CHECK (reorder_threshold >= 0);
+
+CREATE TABLE Low_stock(
+    medication_name TEXT PRIMARY KEY,
+    since TEXT NOT NULL DEFAULT (datetime('now', 'localtime')),  -- when it went below
+
+    FOREIGN KEY (medication_name)
+        REFERENCES Medication(name)
+);
+
+INSERT INTO Low_stock (medication_name)
+SELECT name FROM Medication WHERE quantity_in_stock < reorder_threshold;
+
+-- only stats.low_stock used it, and every dispense had to maintain it
+DROP INDEX idx_medication_stock;
+
+CREATE TRIGGER trg_low_stock_insert AFTER INSERT ON Medication
+WHEN NEW.quantity_in_stock < NEW.reorder_threshold
+BEGIN
+    INSERT INTO Low_stock (medication_name) VALUES (NEW.name);
+END;
+
+CREATE TRIGGER trg_low_stock_enter
+AFTER UPDATE OF quantity_in_stock, reorder_threshold ON Medication
+WHEN NEW.quantity_in_stock < NEW.reorder_threshold
+ AND OLD.quantity_in_stock >= OLD.reorder_threshold
+BEGIN
+    INSERT OR IGNORE INTO Low_stock (medication_name) VALUES (NEW.name);
+END;
+
+CREATE TRIGGER trg_low_stock_leave
+AFTER UPDATE OF quantity_in_stock, reorder_threshold ON Medication
+WHEN NEW.quantity_in_stock >= NEW.reorder_threshold
+ AND OLD.quantity_in_stock < OLD.reorder_threshold
+BEGIN
+    DELETE FROM Low_stock WHERE medication_name = NEW.name;
+END;
+
+CREATE TRIGGER trg_low_stock_delete AFTER DELETE ON Medication
+BEGIN
+    DELETE FROM Low_stock WHERE medication_name = OLD.name;
+END;
@@ -0,0 +1,94 @@
+--SJSU CMPE 138 FALL 2025 TEAM6
+-- Full-text search over patients, doctors and medications.
+--
+-- One FTS5 table per entity with word tokens and 2/3-character prefix
+-- indexes, so "joh" or "408 555" finds rows by the start of any word of a
+-- name, phone number, city, department or storage location. Each has an
+-- fts5vocab table listing its words, which services.py uses to correct
+-- misspelt words. Patient_fts and Doctor_fts are external content tables
+-- over their INTEGER PRIMARY KEY, so they only hold the index. Medication is
+-- keyed by name, so Medication_fts stores the name itself (the catalog is
+-- small enough that finding a row by name to delete is cheap). The triggers
+-- keep all three in step with inserts, deletes and edits of the indexed
+-- columns only; stock changes never touch Medication_fts.
+
+CREATE VIRTUAL TABLE Patient_fts USING fts5(
+    name, phone_number, city,
+    content = 'Patient', content_rowid = 'patient_id', prefix = '2 3'
+);
+INSERT INTO Patient_fts (Patient_fts) VALUES ('rebuild');
+-- a hit in the name counts for more than one in the phone number or city
+INSERT INTO Patient_fts (Patient_fts, rank) VALUES ('rank', 'bm25(10.0, 1.0, 1.0)');
+CREATE VIRTUAL TABLE Patient_terms USING fts5vocab(Patient_fts, 'row');
+
+CREATE VIRTUAL TABLE Doctor_fts USING fts5(
+    name, department_name,
+    content = 'Doctor', content_rowid = 'id', prefix = '2 3'
+);
+INSERT INTO Doctor_fts (Doctor_fts) VALUES ('rebuild');
+INSERT INTO Doctor_fts (Doctor_fts, rank) VALUES ('rank', 'bm25(10.0, 1.0)');
+CREATE VIRTUAL TABLE Doctor_terms USING fts5vocab(Doctor_fts, 'row');
+
+CREATE VIRTUAL TABLE Medication_fts USING fts5(name, location, prefix = '2 3');
+INSERT INTO Medication_fts (name, location) SELECT name, location FROM Medication;
+INSERT INTO Medication_fts (Medication_fts, rank) VALUES ('rank', 'bm25(10.0, 1.0)');
+CREATE VIRTUAL TABLE Medication_terms USING fts5vocab(Medication_fts, 'row');
+
+-- Patient
+CREATE TRIGGER trg_patient_fts_insert AFTER INSERT ON Patient
+BEGIN
+    INSERT INTO Patient_fts (rowid, name, phone_number, city)
+    VALUES (NEW.patient_id, NEW.name, NEW.phone_number, NEW.city);
+END;
+
+CREATE TRIGGER trg_patient_fts_delete AFTER DELETE ON Patient
+BEGIN
+    INSERT INTO Patient_fts (Patient_fts, rowid, name, phone_number, city)
+    VALUES ('delete', OLD.patient_id, OLD.name, OLD.phone_number, OLD.city);
+END;
+
+CREATE TRIGGER trg_patient_fts_update AFTER UPDATE OF name, phone_number, city ON Patient
+BEGIN
+    INSERT INTO Patient_fts (Patient_fts, rowid, name, phone_number, city)
+    VALUES ('delete', OLD.patient_id, OLD.name, OLD.phone_number, OLD.city);
+    INSERT INTO Patient_fts (rowid, name, phone_number, city)
+    VALUES (NEW.patient_id, NEW.name, NEW.phone_number, NEW.city);
+END;
+
+-- Doctor
+CREATE TRIGGER trg_doctor_fts_insert AFTER INSERT ON Doctor
+BEGIN
+    INSERT INTO Doctor_fts (rowid, name, department_name)
+    VALUES (NEW.id, NEW.name, NEW.department_name);
+END;
+
+CREATE TRIGGER trg_doctor_fts_delete AFTER DELETE ON Doctor
+BEGIN
+    INSERT INTO Doctor_fts (Doctor_fts, rowid, name, department_name)
+    VALUES ('delete', OLD.id, OLD.name, OLD.department_name);
+END;
+
+CREATE TRIGGER trg_doctor_fts_update AFTER UPDATE OF name, department_name ON Doctor
+BEGIN
+    INSERT INTO Doctor_fts (Doctor_fts, rowid, name, department_name)
+    VALUES ('delete', OLD.id, OLD.name, OLD.department_name);
+    INSERT INTO Doctor_fts (rowid, name, department_name)
+    VALUES (NEW.id, NEW.name, NEW.department_name);
+END;
+
+-- Medication
+CREATE TRIGGER trg_medication_fts_insert AFTER INSERT ON Medication
+BEGIN
+    INSERT INTO Medication_fts (name, location) VALUES (NEW.name, NEW.location);
+END;
+
+CREATE TRIGGER trg_medication_fts_delete AFTER DELETE ON Medication
+BEGIN
+    DELETE FROM Medication_fts WHERE name = OLD.name;
+END;
+
+CREATE TRIGGER trg_medication_fts_update AFTER UPDATE OF name, location ON Medication
+BEGIN
+    DELETE FROM Medication_fts WHERE name = OLD.name;
+    INSERT INTO Medication_fts (name, location) VALUES (NEW.name, NEW.location);
+END;
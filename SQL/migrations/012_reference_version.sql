@@ -0,0 +1,91 @@
+--SJSU CMPE 138 FALL 2025 TEAM6
+-- Version counter for the reference tables behind refcache.py.
+--
+-- Doctors, departments, pharmacies and the specialist/primary care lists
+-- change rarely. Any insert, update or delete on them bumps
+-- Reference_version.n, whichever connection or process does it, so the
+-- in-process cache can tell with one single-row read whether its copy is
+-- still current. db_id tells databases apart when one process opens several.
+
+CREATE TABLE Reference_version(
+    id    INTEGER PRIMARY KEY CHECK (id = 1),
+    db_id TEXT NOT NULL,
+    n     INTEGER NOT NULL
+);
+
+INSERT INTO Reference_version (id, db_id, n) VALUES (1, lower(hex(randomblob(8))), 0);
+
+CREATE TRIGGER trg_reference_doctor_insert AFTER INSERT ON Doctor
+BEGIN
+    UPDATE Reference_version SET n = n + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER trg_reference_doctor_update AFTER UPDATE ON Doctor
+BEGIN
+    UPDATE Reference_version SET n = n + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER trg_reference_doctor_delete AFTER DELETE ON Doctor
+BEGIN
+    UPDATE Reference_version SET n = n + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER trg_reference_department_insert AFTER INSERT ON Department
+BEGIN
+    UPDATE Reference_version SET n = n + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER trg_reference_department_update AFTER UPDATE ON Department
+BEGIN
+    UPDATE Reference_version SET n = n + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER trg_reference_department_delete AFTER DELETE ON Department
+BEGIN
+    UPDATE Reference_version SET n = n + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER trg_reference_pharmacy_insert AFTER INSERT ON Pharmacy
+BEGIN
+    UPDATE Reference_version SET n = n + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER trg_reference_pharmacy_update AFTER UPDATE ON Pharmacy
+BEGIN
+    UPDATE Reference_version SET n = n + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER trg_reference_pharmacy_delete AFTER DELETE ON Pharmacy
+BEGIN
+    UPDATE Reference_version SET n = n + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER trg_reference_specialist_insert AFTER INSERT ON Specialist
+BEGIN
+    UPDATE Reference_version SET n = n + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER trg_reference_specialist_update AFTER UPDATE ON Specialist
+BEGIN
+    UPDATE Reference_version SET n = n + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER trg_reference_specialist_delete AFTER DELETE ON Specialist
+BEGIN
+    UPDATE Reference_version SET n = n + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER trg_reference_primary_care_insert AFTER INSERT ON Primary_Care
+BEGIN
+    UPDATE Reference_version SET n = n + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER trg_reference_primary_care_update AFTER UPDATE ON Primary_Care
+BEGIN
+    UPDATE Reference_version SET n = n + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER trg_reference_primary_care_delete AFTER DELETE ON Primary_Care
+BEGIN
+    UPDATE Reference_version SET n = n + 1 WHERE id = 1;
+END;